@@ -10,7 +10,8 @@
 # Results are displayed based on the search criteria.
 #
 # Usage:
-#   ./configSearchTool.sh [-m <model>] [-s <section>] [-z <query>] [-d <directory>] [-h]
+#   ./configSearchTool.sh [-m <model>] [-s <section>] [-z <query>] [-q <expression>] [-d <directory>]
+#                         [-r] [-i <glob>] [-x <glob>] [-g] [-l <rules>] [-M] [-h]
 #
 # Arguments:
 #   -m <model>   : Specify a device model (e.g., iPhone14,4)
@@ -24,11 +25,40 @@
 #                  If used with -s, it will search only within the specified section.
 #                  If used alone, it will search across all sections in all files.
 #
+#   -q <expression> : Specify a boolean expression over sections, keys and values
+#                  (e.g., "[Proximity] AND NOT [CameraRearPhoto].CamerasToSkip = 6")
+#                  Predicates are [Section], [Section].Key, [Section].Key = value and
+#                  [Section].Key ~ regex (or Key... for any section), combined with
+#                  AND, OR, NOT and parentheses. Cannot be combined with -s or -z.
+#
 #   -d <directory> : Specify which directory to search in. Options:
 #                    1 - DUT Parameters (/var/db/fusion/test_parameters/test_parameter_configs/dut_parameters)
 #                    2 - DUT Configurations (/var/db/fusion/dut_configurations)
+#                    A directory path or a .tar.gz/.tgz/.zip snapshot archive may also be given.
 #                    If not specified, you will be prompted to choose.
 #
+#   -r           : Search subdirectories too. Results are named by their path relative to
+#                  the search directory (e.g., samsung/a01q), and -m matches either the
+#                  relative path or the bare model name.
+#
+#   -i <glob>    : Only search config files whose relative path, file name, or one of whose
+#                  directories (by path or name) matches the glob (e.g., "samsung", "samsung/*"
+#                  or "a0*"). May be given more than once.
+#
+#   -x <glob>    : Skip config files matching the glob by the same rule as -i, and do not
+#                  enter matching subdirectories (e.g., "legacy"). May be given more than once.
+#
+#   -g           : When showing a section across all models, show each distinct copy of the
+#                  section once with the models that share it, instead of once per model.
+#                  Spacing differences and trailing blank lines are ignored.
+#
+#   -l <rules>   : Check every config against a rules file (JSON, or YAML with PyYAML)
+#                  of section/key/value constraints and report the violations.
+#                  See config_lint.py for the rule format. Honours -r.
+#
+#   -M           : Report the memory needed to hold the parsed configs resident, for the
+#                  directory given with -d or, without -d, for every configured directory.
+#
 #   -h           : Display this help message
 #
 # Search Behavior:
@@ -39,6 +69,12 @@
 #   - When using -z with -s: Searches for the query within the specified section in all config files.
 #   - When using -z with -m: Searches for the query in the specified model's config file.
 #   - When using -z with -m and -s: Searches for the query within the specified section in the specified model's config file.
+#   - When using -q: Lists the models matching the expression, optionally limited to the model given with -m.
+#   - When using -s with -g: Groups models whose copies of the section are identical ("identical in 143 models: ...").
+#   - When using -l: Checks all rules against every config in one pass; exits non-zero on errors.
+#   - When using -r: Walks the directory tree concurrently and searches every config found, honouring -i and -x.
+#   - When -d points at an archive: Its .ini members are searched in turn with the same rules as a directory, without extracting to disk.
+#     An archive holding a single top-level directory is searched from inside that directory.
 #
 # Examples:
 #   1. Search for a query across all files in the directory:
@@ -56,6 +92,15 @@
 #   5. Search in DUT Configurations directory:
 #      ./configSearchTool.sh -d 2 -m iPhone14,4 -s CameraRearPhoto
 #
+#   6. Search an archived snapshot without extracting it:
+#      ./configSearchTool.sh -d dut_parameters_2024-09-01.tar.gz -s Proximity
+#
+#   7. Search every vendor subdirectory, skipping legacy ones:
+#      ./configSearchTool.sh -d /path/to/custom/configs -r -x legacy -s Proximity
+#
+#   8. Find models with a Proximity section that do not skip camera 6:
+#      ./configSearchTool.sh -q "[Proximity] AND NOT [CameraRearPhoto].CamerasToSkip = 6"
+#
 # Output:
 #   The script will display results based on the search criteria used.
 #
@@ -82,6 +127,9 @@ BLUE='\033[0;34m'
 YELLOW='\033[0;33m'
 NC='\033[0m' # No Color
 
+# Location of the Python helpers installed alongside this script
+SCRIPT_DIR="$(dirname "$(readlink -f "$0")")"
+
 # Function to print usage
 # Print usage information and exit
 # 
@@ -107,7 +155,7 @@ select_directory() {
     echo -e "${YELLOW}3)${NC} Legacy Parameters ($LEGACY_PARAMETERS)"
     echo -e "${YELLOW}4)${NC} Legacy Configurations ($LEGACY_CONFIGURATIONS)"
     echo -e "${YELLOW}5)${NC} Trades Parameters ($TRADES_PARAMETERS)"
-    echo -e "${YELLOW}6)${NC} Custom directory path"
+    echo -e "${YELLOW}6)${NC} Custom directory or archive path"
     
     read -p "Enter your choice [1-6]: " dir_choice
     
@@ -118,11 +166,11 @@ select_directory() {
         4) search_dir="$LEGACY_CONFIGURATIONS" ;;
         5) search_dir="$TRADES_PARAMETERS" ;;
         6) 
-           read -p "Enter custom directory path: " custom_dir
-           if [ -d "$custom_dir" ]; then
+           read -p "Enter custom directory or archive path: " custom_dir
+           if [ -d "$custom_dir" ] || is_archive "$custom_dir"; then
                search_dir="$custom_dir"
            else
-               echo -e "${RED}Error: Directory does not exist.${NC}"
+               echo -e "${RED}Error: Directory or archive does not exist.${NC}"
                exit 1
            fi
            ;;
@@ -133,6 +181,44 @@ select_directory() {
     esac
 }
 
+# Function to check for a supported snapshot archive
+is_archive() {
+    case "$1" in
+        *.tar.gz|*.tgz|*.zip) [ -f "$1" ] ;;
+        *) return 1 ;;
+    esac
+}
+
+# Function to stream archive members
+# Stream the selected .ini members of an archive to stdout without extracting it.
+#
+# Each member is written as its path followed by its content, both NUL
+# terminated, so the caller can read one member at a time with read -d ''.
+# config_corpus.py does the reading: when every member sits under one
+# top-level directory (as with "tar czf snap.tgz dut_parameters"), that
+# directory is the archive root, and -r, -i and -x select members exactly as
+# they select files in a directory. A nested model path given with -m is
+# found without -r, as it is in a directory. If the archive cannot be read,
+# a member with an empty path is written so the caller can tell a corrupt
+# archive from one without matches.
+stream_archive() {
+    local archive=$1
+    local archive_args=()
+    local glob
+    
+    if [ "$recursive" = true ] || [[ "$model" == */* ]]; then
+        archive_args+=(-r)
+    fi
+    for glob in "${include_globs[@]}"; do
+        archive_args+=(-i "$glob")
+    done
+    for glob in "${exclude_globs[@]}"; do
+        archive_args+=(-x "$glob")
+    done
+    
+    python3 "$SCRIPT_DIR/config_corpus.py" archive "$archive" "${archive_args[@]}" 2>/dev/null
+}
+
 # Function to search for query
 # Search for a query in a file, either in all sections or in a specific one.
 #
@@ -157,6 +243,195 @@ search_query() {
     fi
 }
 
+# Function to list configs under a directory
+# List config files under a directory as NUL-terminated relative paths.
+#
+# The listing is done by config_corpus.py, which walks subdirectories with a
+# thread pool when -r is used and prunes excluded directories early.
+walk_configs() {
+    local search_dir=$1
+    local walk_args=()
+    local glob
+    
+    if [ "$recursive" = true ]; then
+        walk_args+=(-r)
+    fi
+    for glob in "${include_globs[@]}"; do
+        walk_args+=(-i "$glob")
+    done
+    for glob in "${exclude_globs[@]}"; do
+        walk_args+=(-x "$glob")
+    done
+    
+    python3 "$SCRIPT_DIR/config_corpus.py" walk "$search_dir" "${walk_args[@]}"
+}
+
+# Function to show a section grouped by content
+# Show a section across all models, printing each distinct copy once.
+#
+# Sections are compared by a hash of their normalized content in
+# config_corpus.py, so every file is read once and shared blocks are only
+# rendered once, with the list of models that contain them.
+group_section_search() {
+    local search_dir=$1
+    local section=$2
+    local walk_args=()
+    local glob
+    
+    if [ "$recursive" = true ]; then
+        walk_args+=(-r)
+    fi
+    for glob in "${include_globs[@]}"; do
+        walk_args+=(-i "$glob")
+    done
+    for glob in "${exclude_globs[@]}"; do
+        walk_args+=(-x "$glob")
+    done
+    
+    python3 "$SCRIPT_DIR/config_corpus.py" sections "$search_dir" "$section" "${walk_args[@]}"
+}
+
+# Function to lint configs against a rules file
+lint_configs() {
+    local search_dir=$1
+    local rules=$2
+    
+    if is_archive "$search_dir" || [ ! -d "$search_dir" ]; then
+        echo -e "${RED}Error: Linting needs a directory, $search_dir is not one.${NC}"
+        return 1
+    fi
+    
+    if [ "$recursive" = true ]; then
+        python3 "$SCRIPT_DIR/config_lint.py" "$search_dir" "$rules" -r
+    else
+        python3 "$SCRIPT_DIR/config_lint.py" "$search_dir" "$rules"
+    fi
+}
+
+# Function to report the resident memory footprint
+# Report the memory a compact parsed copy of the given directories would use.
+#
+# Without arguments every configured directory is measured, which is the
+# footprint of keeping all of them resident at once.
+report_footprint() {
+    local roots=("$@")
+    local root
+    
+    if [ ${#roots[@]} -eq 0 ]; then
+        for root in "$DUT_PARAMETERS" "$DUT_CONFIGURATIONS" "$LEGACY_PARAMETERS" "$LEGACY_CONFIGURATIONS" "$TRADES_PARAMETERS"; do
+            if [ -n "$root" ]; then
+                roots+=("$root")
+            fi
+        done
+    fi
+    
+    if [ ${#roots[@]} -eq 0 ]; then
+        echo -e "${RED}Error: No directories configured.${NC}"
+        return 1
+    fi
+    
+    if [ "$recursive" = true ]; then
+        python3 "$SCRIPT_DIR/config_corpus.py" footprint -r "${roots[@]}"
+    else
+        python3 "$SCRIPT_DIR/config_corpus.py" footprint "${roots[@]}"
+    fi
+}
+
+# Function to suggest names
+# Print ranked "did you mean" candidates for a section or key that was not found.
+#
+# Candidates come from a trigram index over the cached section and key names
+# of the directory, so no config file is read again.
+suggest_names() {
+    local search_dir=$1
+    local name=$2
+    local kind=$3
+    
+    python3 "$SCRIPT_DIR/config_corpus.py" suggest "$search_dir" "$name" --kind "$kind" 2>/dev/null
+}
+
+# Function to search a single config
+# Apply the search criteria to one config and record the outcome.
+#
+# The config is read through the given path exactly once, so it may be a
+# regular file or a pipe streaming an archive member. Results are appended to
+# the found_results and not_found_results arrays of perform_search.
+search_config() {
+    local model_name=$1
+    local file=$2
+    local query_result section_text
+    
+    if [ -n "$query" ]; then
+        query_result=$(search_query "$file" "$query" "$section")
+        if [ -n "$query_result" ]; then
+            found_results+=("${GREEN}✓ $model_name: Query found${NC}")
+            found_results+=("$query_result")
+            found_results+=("----------------------------------------")
+            ((files_with_match++))
+        else
+            not_found_results+=("${RED}✗ $model_name: Query not found${NC}")
+            not_found_results+=("----------------------------------------")
+        fi
+    elif [ -n "$section" ]; then
+        # Read the config once: the range starts at the header, so it is empty when missing
+        section_text=$(sed -n "/\[$section\]/,/^\[/p" "$file")
+        if [ -n "$section_text" ]; then
+            found_results+=("${GREEN}✓ $model_name: Section [$section] found${NC}")
+            # Drop the trailing line when it is the next section header
+            if [[ "$section_text" == *$'\n'* && "${section_text##*$'\n'}" == \[* ]]; then
+                section_text="${section_text%$'\n'*}"
+            fi
+            found_results+=("$section_text")
+            found_results+=("----------------------------------------")
+            ((files_with_match++))
+        else
+            not_found_results+=("${RED}✗ $model_name: Section [$section] not found${NC}")
+            not_found_results+=("----------------------------------------")
+        fi
+    else
+        found_results+=("${GREEN}✓ $model_name${NC}")
+        # When searching only by model, display the file content
+        found_results+=("$(cat "$file")")
+        found_results+=("----------------------------------------")
+        ((files_with_match++))
+    fi
+}
+
+# Function to run a boolean expression search
+# Evaluate a boolean expression against every config in a directory.
+#
+# The expression is planned and evaluated by config_query.py, which answers
+# section and key predicates from a cached index and only opens the files
+# that value predicates still need.
+expression_search() {
+    local search_dir=$1
+    local model=$2
+    local expression=$3
+    local query_args=()
+    local glob
+    
+    if is_archive "$search_dir" || [ ! -d "$search_dir" ]; then
+        echo -e "${RED}Error: Expression search needs a directory, $search_dir is not one.${NC}"
+        return 1
+    fi
+    
+    if [ -n "$model" ]; then
+        query_args+=(--model "$model")
+    fi
+    # A nested model path is found without -r, as in a plain search
+    if [ "$recursive" = true ] || [[ "$model" == */* ]]; then
+        query_args+=(-r)
+    fi
+    for glob in "${include_globs[@]}"; do
+        query_args+=(-i "$glob")
+    done
+    for glob in "${exclude_globs[@]}"; do
+        query_args+=(-x "$glob")
+    done
+    
+    python3 "$SCRIPT_DIR/config_query.py" "$search_dir" "$expression" "${query_args[@]}"
+}
+
 # Main function to perform the search
 perform_search() {
     local search_dir=$1
@@ -186,63 +461,95 @@ perform_search() {
     not_found_results=()
     found_results=()
     
-    if [ -n "$model" ]; then
+    archive=""
+    walked=false
+    if is_archive "$search_dir"; then
+        archive="$search_dir"
+    elif [ ! -d "$search_dir" ]; then
+        # Check if directory exists
+        echo -e "${RED}Error: Directory $search_dir does not exist.${NC}"
+        return 1
+    elif [ "$recursive" = true ] || [ ${#include_globs[@]} -gt 0 ] || [ ${#exclude_globs[@]} -gt 0 ]; then
+        walked=true
+        files=()
+        while IFS= read -r -d '' relative; do
+            if [ -n "$model" ]; then
+                filename="${relative##*/}"
+                if [ "${relative%.*}" != "$model" ] && [ "${filename%.*}" != "$model" ]; then
+                    continue
+                fi
+            fi
+            files+=("$search_dir/$relative")
+        done < <(walk_configs "$search_dir")
+        
+        if [ ${#files[@]} -eq 0 ]; then
+            if [ -n "$model" ]; then
+                echo -e "${RED}Error: File for model $model not found in $search_dir${NC}"
+            else
+                echo -e "${RED}Error: No .ini files found in $search_dir${NC}"
+            fi
+            return 1
+        fi
+    elif [ -n "$model" ]; then
         files=("$search_dir/${model}.ini")
     else
         files=("$search_dir"/*.ini)
     fi
     
-    # Check if directory exists and has .ini files
-    if [ ! -d "$search_dir" ]; then
-        echo -e "${RED}Error: Directory $search_dir does not exist.${NC}"
+    # Check if the directory has .ini files
+    if [ -z "$archive" ] && [ "$walked" = false ] && [ -z "$(ls -A "$search_dir"/*.ini 2>/dev/null)" ] && [ -z "$model" ]; then
+        echo -e "${RED}Error: No .ini files found in $search_dir${NC}"
         return 1
     fi
     
-    if [ -z "$(ls -A "$search_dir"/*.ini 2>/dev/null)" ] && [ -z "$model" ]; then
-        echo -e "${RED}Error: No .ini files found in $search_dir${NC}"
-        return 1
+    # Identical sections across all models are rendered once per distinct copy
+    if [ "$group_sections" = true ] && [ -z "$archive" ] && [ -n "$section" ] && [ -z "$model" ] && [ -z "$query" ]; then
+        group_section_search "$search_dir" "$section"
+        return
     fi
     
     # Process files
-    for file in "${files[@]}"; do
-        if [ -f "$file" ]; then
-            ((files_searched++))
-            filename=$(basename "$file")
-            model_name="${filename%.*}"
-            
-            if [ -n "$query" ]; then
-                query_result=$(search_query "$file" "$query" "$section")
-                if [ -n "$query_result" ]; then
-                    found_results+=("${GREEN}✓ $model_name: Query found${NC}")
-                    found_results+=("$query_result")
-                    found_results+=("----------------------------------------")
-                    ((files_with_match++))
-                else
-                    not_found_results+=("${RED}✗ $model_name: Query not found${NC}")
-                    not_found_results+=("----------------------------------------")
-                fi
-            elif [ -n "$section" ]; then
-                if grep -q "\[$section\]" "$file"; then
-                    found_results+=("${GREEN}✓ $model_name: Section [$section] found${NC}")
-                    found_results+=("$(sed -n "/\[$section\]/,/^\[/p" "$file" | sed '$d')")
-                    found_results+=("----------------------------------------")
-                    ((files_with_match++))
-                else
-                    not_found_results+=("${RED}✗ $model_name: Section [$section] not found${NC}")
-                    not_found_results+=("----------------------------------------")
-                fi
-            else
-                found_results+=("${GREEN}✓ $model_name${NC}")
-                # When searching only by model, display the file content
-                found_results+=("$(cat "$file")")
-                found_results+=("----------------------------------------")
-                ((files_with_match++))
+    if [ -n "$archive" ]; then
+        archive_failed=false
+        while IFS= read -r -d '' member && IFS= read -r -d '' content; do
+            if [ -z "$member" ]; then
+                archive_failed=true
+                break
             fi
-        elif [ -n "$model" ]; then
+            filename="${member##*/}"
+            if [ -n "$model" ] && [ "${filename%.*}" != "$model" ] && [ "${member%.*}" != "$model" ]; then
+                continue
+            fi
+            # Results carry the path relative to the archive root
+            model_name="${member%.*}"
+            ((files_searched++))
+            search_config "$model_name" <(printf '%s\n' "$content")
+        done < <(stream_archive "$search_dir")
+        
+        if [ "$archive_failed" = true ]; then
+            echo -e "${RED}Error: Could not read archive $search_dir${NC}"
+            return 1
+        elif [ -n "$model" ] && [ "$files_searched" -eq 0 ]; then
             echo -e "${RED}Error: File for model $model not found in $search_dir${NC}"
             return 1
+        elif [ "$files_searched" -eq 0 ]; then
+            echo -e "${RED}Error: No .ini files found in $search_dir${NC}"
+            return 1
         fi
-    done
+    else
+        for file in "${files[@]}"; do
+            if [ -f "$file" ]; then
+                ((files_searched++))
+                # Results carry the path relative to the search directory
+                relative="${file#"$search_dir"/}"
+                model_name="${relative%.*}"
+                search_config "$model_name" "$file"
+            elif [ -n "$model" ]; then
+                echo -e "${RED}Error: File for model $model not found in $search_dir${NC}"
+                return 1
+            fi
+        done
+    fi
     
     # Print results
     echo
@@ -258,8 +565,19 @@ perform_search() {
         # If nothing was found, show a single message rather than individual "not found" results
         if [ -n "$query" ]; then
             echo -e "${RED}Query \"$query\" not found in any searched files.${NC}"
+            # A query that is a plain key name, or starts with one before '=',
+            # may be a misspelled key
+            query_key="${query%%=*}"
+            query_key="${query_key%"${query_key##*[![:space:]]}"}"
+            query_key="${query_key#"${query_key%%[![:space:]]*}"}"
+            if [ -z "$archive" ] && [ "$walked" = false ] && [[ "$query_key" =~ ^[[:alnum:]_]+$ ]]; then
+                suggest_names "$search_dir" "$query_key" key
+            fi
         elif [ -n "$section" ]; then
             echo -e "${RED}Section [$section] not found in any searched files.${NC}"
+            if [ -z "$archive" ] && [ "$walked" = false ]; then
+                suggest_names "$search_dir" "$section" section
+            fi
         else
             echo -e "${RED}No matching files found.${NC}"
         fi
@@ -280,6 +598,11 @@ perform_search() {
 # Parse command line arguments
 interactive_mode=false
 show_exit_hint=false
+recursive=false
+group_sections=false
+report_memory=false
+include_globs=()
+exclude_globs=()
 
 # Check if script is run without arguments
 if [ $# -eq 0 ]; then
@@ -288,12 +611,19 @@ fi
 
 # Process command line arguments if not in interactive mode
 if [ "$interactive_mode" = false ]; then
-    while getopts ":m:s:z:d:h" opt; do
+    while getopts ":m:s:z:q:d:ri:x:gl:Mh" opt; do
         case $opt in
             m) model="$OPTARG" ;;
             s) section="$OPTARG" ;;
             z) query="$OPTARG" ;;
+            q) expression="$OPTARG" ;;
             d) dir_option="$OPTARG" ;;
+            r) recursive=true ;;
+            i) include_globs+=("$OPTARG") ;;
+            x) exclude_globs+=("$OPTARG") ;;
+            g) group_sections=true ;;
+            l) rules_file="$OPTARG" ;;
+            M) report_memory=true ;;
             h) usage ;;
             \?) echo -e "${RED}Invalid option -$OPTARG${NC}" >&2; usage ;;
         esac
@@ -308,8 +638,12 @@ if [ "$interactive_mode" = false ]; then
             4) search_dir="$LEGACY_CONFIGURATIONS" ;;
             5) search_dir="$TRADES_PARAMETERS" ;;
             *)
-               echo -e "${RED}Invalid directory option. Using default: DUT Parameters.${NC}"
-               search_dir="$DUT_PARAMETERS"
+               if [ -d "$dir_option" ] || is_archive "$dir_option"; then
+                   search_dir="$dir_option"
+               else
+                   echo -e "${RED}Invalid directory option. Using default: DUT Parameters.${NC}"
+                   search_dir="$DUT_PARAMETERS"
+               fi
                ;;
         esac
     else
@@ -318,7 +652,21 @@ if [ "$interactive_mode" = false ]; then
     fi
     
     # Perform the search
-    if [ -z "$model" ] && [ -z "$section" ] && [ -z "$query" ]; then
+    if [ "$report_memory" = true ]; then
+        if [ -n "$dir_option" ]; then
+            report_footprint "$search_dir"
+        else
+            report_footprint
+        fi
+    elif [ -n "$rules_file" ]; then
+        lint_configs "$search_dir" "$rules_file"
+    elif [ -n "$expression" ]; then
+        if [ -n "$section" ] || [ -n "$query" ]; then
+            echo -e "${RED}Error: -q cannot be combined with -s or -z.${NC}"
+            usage
+        fi
+        expression_search "$search_dir" "$model" "$expression"
+    elif [ -z "$model" ] && [ -z "$section" ] && [ -z "$query" ]; then
         echo -e "${RED}Error: No search criteria provided.${NC}"
         usage
     else
@@ -334,6 +682,7 @@ else
         model=""
         section=""
         query=""
+        expression=""
         search_dir=""
         
         # Show exit hint after first search
@@ -353,8 +702,9 @@ else
         echo -e "${YELLOW}3)${NC} Search by query string"
         echo -e "${YELLOW}4)${NC} Search by model and section"
         echo -e "${YELLOW}5)${NC} Advanced search (combine options)"
+        echo -e "${YELLOW}6)${NC} Boolean expression search"
         
-        read -p "Enter your choice [1-5]: " search_choice
+        read -p "Enter your choice [1-6]: " search_choice
         
         case $search_choice in
             1) 
@@ -386,20 +736,27 @@ else
                     query="$query_input"
                 fi
                 ;;
+            6)
+                read -p "Enter expression (e.g., [Proximity] AND NOT EnableTopBar = True): " expression
+                ;;
             *)
-                echo -e "${RED}Invalid choice. Please select from options 1-5.${NC}"
+                echo -e "${RED}Invalid choice. Please select from options 1-6.${NC}"
                 continue
                 ;;
         esac
         
         # Check if at least one search argument is provided
-        if [ -z "$model" ] && [ -z "$section" ] && [ -z "$query" ]; then
+        if [ -z "$model" ] && [ -z "$section" ] && [ -z "$query" ] && [ -z "$expression" ]; then
             echo -e "${RED}Error: No search criteria provided.${NC}"
             continue
         fi
         
         # Perform the search
-        perform_search "$search_dir" "$model" "$section" "$query"
+        if [ -n "$expression" ]; then
+            expression_search "$search_dir" "$model" "$expression"
+        else
+            perform_search "$search_dir" "$model" "$section" "$query"
+        fi
         
         # Set flag to show exit hint in subsequent iterations
         show_exit_hint=true
@@ -0,0 +1,761 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for reading .ini config trees
+
+The search script works line by line with grep, sed and awk. The Python
+tools built on top of it (history, export, linting...) need a structured view
+of the same files, so the parsing rules live here and mirror the script:
+a section starts at a line holding [Name] and runs until the next line that
+starts with '['.
+
+Usage:
+    config_corpus.py walk <directory> [-r] [-i GLOB]... [-x GLOB]... [--workers N]
+    config_corpus.py archive <archive> [-r] [-i GLOB]... [-x GLOB]...
+    config_corpus.py footprint <directory>... [-r] [--budget MB]
+    config_corpus.py suggest <directory> <name> [--kind section|key] [--limit N]
+    config_corpus.py sections <directory> <section> [-r] [-i GLOB]... [-x GLOB]...
+"""
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tarfile
+import zipfile
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Color codes, matching configSearchTool.sh so the GUI renders both the same way
+GREEN = '\033[0;32m'
+RED = '\033[0;31m'
+BLUE = '\033[0;34m'
+YELLOW = '\033[0;33m'
+NC = '\033[0m'  # No Color
+
+SEPARATOR = "-" * 40
+
+# Default locations for data the tools keep between runs
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "config-search-tool")
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".local", "share", "config-search-tool")
+
+# Memory the resident corpus of all configured roots is expected to fit in
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+
+def list_configs(directory):
+    """Return sorted (model_code, path) pairs for the .ini files in a directory"""
+    return walk_configs(directory)
+
+
+def _glob_match(relative, patterns):
+    """
+    True if a relative path, its file name, or one of its directories matches any glob
+
+    Directories are tried both by their relative path and by their name, so
+    "samsung" selects samsung/a01q.ini and "vendors/samsung" selects
+    vendors/samsung/s21.ini. The search script, its archive mode and the GUI
+    all select files through this one rule.
+    """
+    parts = relative.split('/')
+    candidates = {relative, parts[-1]}
+    for depth in range(1, len(parts)):
+        candidates.add('/'.join(parts[:depth]))
+        candidates.add(parts[depth - 1])
+    return any(fnmatch.fnmatchcase(candidate, pattern) for candidate in candidates for pattern in patterns)
+
+
+def walk_configs(directory, recursive=False, include=(), exclude=(), workers=8):
+    """
+    Return sorted (relative_model, path) pairs for the .ini files under a directory
+
+    relative_model is the path relative to directory without the .ini
+    extension, e.g. "samsung/a01q". Only files matching an include glob (if
+    any are given) and no exclude glob are returned, by the rules of
+    _glob_match, and excluded directories are not entered at all. In recursive mode each directory is scanned by a
+    thread pool as soon as it is discovered, which keeps many requests in
+    flight on deep or network-mounted trees.
+    """
+    def scan(relative):
+        files, subdirs = [], []
+        try:
+            with os.scandir(os.path.join(directory, relative)) as entries:
+                for entry in entries:
+                    entry_relative = os.path.join(relative, entry.name) if relative else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and not _glob_match(entry_relative, exclude):
+                            subdirs.append(entry_relative)
+                    elif entry.name.endswith('.ini') and entry.is_file():
+                        if include and not _glob_match(entry_relative, include):
+                            continue
+                        if _glob_match(entry_relative, exclude):
+                            continue
+                        files.append((entry_relative[:-4], entry.path))
+        except OSError:
+            # Unreadable subdirectories are skipped; the root itself must be readable
+            if not relative:
+                raise
+        return files, subdirs
+
+    if not recursive:
+        configs = scan("")[0]
+        configs.sort()
+        return configs
+
+    configs = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(scan, "")}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                configs.extend(files)
+                pending.update(pool.submit(scan, subdir) for subdir in subdirs)
+    configs.sort()
+    return configs
+
+
+def archive_root(names):
+    """
+    Return the "dir/" prefix shared by every member name, or "" if there is none
+
+    Snapshots are usually made with "tar czf snap.tgz dut_parameters", so every
+    member sits under one top-level directory. That directory is treated as
+    the root of the archive, the way the directory itself would be searched.
+    """
+    tops = {name.split('/', 1)[0] for name in names}
+    if len(tops) == 1 and all('/' in name for name in names):
+        return f"{tops.pop()}/"
+    return ""
+
+
+def select_archive_members(names, recursive=False, include=(), exclude=()):
+    """
+    Return sorted (relative_model, name) pairs for the .ini members of an archive
+
+    Members are selected by the same rules as walk_configs: relative_model is
+    relative to the archive root, only top-level members are kept unless
+    recursive, and globs are matched by _glob_match.
+    """
+    names = [name for name in names if name.endswith('.ini')]
+    relatives = [name[2:] if name.startswith('./') else name for name in names]
+    prefix = archive_root(relatives)
+
+    members = []
+    for name, relative in zip(names, relatives):
+        relative = relative[len(prefix):]
+        if '/' in relative and not recursive:
+            continue
+        if include and not _glob_match(relative, include):
+            continue
+        if _glob_match(relative, exclude):
+            continue
+        members.append((relative[:-4], name))
+    members.sort()
+    return members
+
+
+def _read_tarball(path, wanted):
+    """
+    Return {name: content} for the regular files of a tarball in one pass
+
+    Content is only read for the names wanted() accepts; the others map to
+    None. tarfile stops quietly at a damaged header, so the gzip stream is
+    read to its end afterwards, which raises EOFError if it was cut short.
+    """
+    with gzip.open(path, 'rb') as stream:
+        with tarfile.open(fileobj=stream, mode='r|') as archive:
+            files = {member.name: archive.extractfile(member).read() if wanted(member.name) else None
+                     for member in archive if member.isfile()}
+        while stream.read(1 << 20):
+            pass
+    return files
+
+
+def list_archive(path):
+    """Member names of a .tar.gz, .tgz or .zip archive, without extracting it"""
+    if path.endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            return [info.filename for info in archive.infolist() if not info.is_dir()]
+    return list(_read_tarball(path, lambda name: False))
+
+
+def read_archive_configs(path, recursive=False, include=(), exclude=()):
+    """
+    Return sorted (relative_model, text) pairs for the selected configs of an archive
+
+    Zip members are read in place through the central directory. A tarball
+    can only be read front to back, and its root is only known once every
+    header has been seen, so the .ini members are kept in memory during the
+    single decompression pass and selected afterwards.
+    """
+    if path.endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            names = [info.filename for info in archive.infolist() if not info.is_dir()]
+            return [(relative_model, archive.read(name).decode('utf-8', errors='replace'))
+                    for relative_model, name in select_archive_members(names, recursive, include, exclude)]
+
+    contents = _read_tarball(path, lambda name: name.endswith('.ini'))
+    return [(relative_model, contents[name].decode('utf-8', errors='replace'))
+            for relative_model, name in select_archive_members(list(contents), recursive, include, exclude)]
+
+
+def read_config(path):
+    """Read a config file, tolerating stray non UTF-8 bytes"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def parse_sections(text):
+    """
+    Split config text into (section, line, body) tuples
+
+    line is the 1-based line number of the section header and body is the
+    section text including its header. Lines before the first header are
+    returned as a section named "" starting at line 1, if there are any.
+    """
+    sections = []
+    name, start, lines = "", 1, []
+    for number, line in enumerate(text.splitlines(), 1):
+        if line.startswith('['):
+            if lines:
+                sections.append((name, start, "\n".join(lines)))
+            stripped = line.strip()
+            name = stripped[1:stripped.index(']')] if ']' in stripped else stripped[1:]
+            start, lines = number, []
+        lines.append(line)
+    if lines:
+        sections.append((name, start, "\n".join(lines)))
+    return sections
+
+
+def parse_entries(body, start=1):
+    """
+    Return the (key, value, line) entries of a section body
+
+    Comment lines (# or ;), blank lines and lines without '=' are skipped.
+    line numbers are counted from start, the line number of the body's
+    first line.
+    """
+    entries = []
+    for number, line in enumerate(body.splitlines(), start):
+        stripped = line.strip()
+        if not stripped or stripped[0] in '#;[' or '=' not in stripped:
+            continue
+        key, value = stripped.split('=', 1)
+        entries.append((key.strip(), value.strip(), number))
+    return entries
+
+
+def normalize_section(body):
+    """
+    Canonical form of a section body for content comparison
+
+    Trailing whitespace, spacing around '=' and trailing blank lines are
+    ignored, so the same section copied between models compares equal no
+    matter where it sits in the file. The line count of the part holding
+    entries is preserved.
+    """
+    lines = []
+    for line in body.splitlines():
+        stripped = line.strip()
+        if stripped and stripped[0] not in '#;[' and '=' in stripped:
+            key, value = stripped.split('=', 1)
+            line = f"{key.strip()} = {value.strip()}"
+        lines.append(line.rstrip())
+    while lines and not lines[-1]:
+        lines.pop()
+    return "\n".join(lines)
+
+
+def section_hash(body):
+    """SHA-1 digest (raw bytes, to keep hash tables small) of a section's normalized content"""
+    return hashlib.sha1(normalize_section(body).encode('utf-8')).digest()
+
+
+def group_sections(configs, section):
+    """
+    Group the models whose copies of a section are identical
+
+    configs is a list of (model, path) pairs. Returns (groups, missing)
+    where groups is a list of (body, models) for each distinct normalized
+    section, largest group first, and missing lists the models without the
+    section. body is the section as written in the group's first model, so
+    it renders exactly like a plain search. Each file is read once and each
+    distinct body kept once.
+    """
+    groups = {}  # section_hash -> (body, models)
+    missing = []
+    for model, path in configs:
+        for name, _line, body in parse_sections(read_config(path)):
+            if name == section:
+                digest = section_hash(body)
+                if digest not in groups:
+                    groups[digest] = (body.rstrip(), [])
+                groups[digest][1].append(model)
+                break
+        else:
+            missing.append(model)
+    ordered = sorted(groups.values(), key=lambda group: -len(group[1]))
+    return ordered, missing
+
+
+class SectionIndex:
+    """
+    Which models define which sections and keys in a directory
+
+    The index holds names only, never values, and is cached in CACHE_DIR
+    with each file's mtime and size. refresh() re-reads only the files that
+    changed since the cache was written, so answering "which models have
+    section X / key Y" normally touches no config contents at all. The walk
+    options are part of the cache key, so a recursive or filtered index never
+    overwrites the plain one.
+    """
+
+    def __init__(self, directory, recursive=False, include=(), exclude=(), cache_dir=CACHE_DIR):
+        self.directory = os.path.abspath(directory)
+        self.recursive = recursive
+        self.include = list(include)
+        self.exclude = list(exclude)
+        key = json.dumps([self.directory, recursive, self.include, self.exclude])
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        self.cache_path = os.path.join(cache_dir, f"index-{digest}.json")
+        self.paths = {}  # model -> path
+        self.files = {}  # model -> {"mtime", "size", "sections": {section: [keys]}}
+        self.sections = {}  # section -> set of models
+        self.keys = {}  # (section, key) -> set of models
+        self.files_read = 0
+
+    @property
+    def models(self):
+        return set(self.files)
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("directory") == self.directory:
+                return cached["files"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def _save_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"directory": self.directory, "files": self.files}, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def refresh(self):
+        """Bring the index up to date, reading only new or changed files"""
+        cached = self._load_cache()
+        self.paths = dict(walk_configs(self.directory, self.recursive, self.include, self.exclude))
+        self.files = {}
+        self.files_read = 0
+        for model, path in self.paths.items():
+            stat = os.stat(path)
+            known = cached.get(model)
+            if known and known["mtime"] == stat.st_mtime_ns and known["size"] == stat.st_size:
+                self.files[model] = known
+                continue
+            sections = {}
+            for name, line, body in parse_sections(read_config(path)):
+                keys = sections.setdefault(name, [])
+                for key, _value, _line in parse_entries(body, line):
+                    if key not in keys:
+                        keys.append(key)
+            self.files[model] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sections": sections}
+            self.files_read += 1
+
+        self.sections = {}
+        self.keys = {}
+        for model, info in self.files.items():
+            for section, keys in info["sections"].items():
+                self.sections.setdefault(section, set()).add(model)
+                for key in keys:
+                    self.keys.setdefault((section, key), set()).add(model)
+
+        if self.files_read or len(cached) != len(self.files):
+            self._save_cache()
+        return self
+
+    def models_with_section(self, section):
+        return self.sections.get(section, set())
+
+    def models_with_key(self, section, key):
+        """Models defining key in section, or in any section when section is None"""
+        if section is not None:
+            return self.keys.get((section, key), set())
+        models = set()
+        for (_section, name), section_models in self.keys.items():
+            if name == key:
+                models |= section_models
+        return models
+
+
+def trigrams(text):
+    """Case-insensitive trigrams of a name, padded so short names still have some"""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Trigram index over the section and key names of a SectionIndex
+
+    Built from the cached SectionIndex, so suggesting a correction for a
+    mistyped name never rescans the config files. Candidates are ranked by
+    the Dice coefficient of their trigram sets.
+    """
+
+    def __init__(self, section_index):
+        self.section_index = section_index
+        self.names = []  # (kind, section, key) by name id
+        self.sizes = []  # trigram count by name id
+        self.postings = {}  # trigram -> list of name ids
+        for section in section_index.sections:
+            self._add("section", section, None, section)
+        for section, key in section_index.keys:
+            self._add("key", section, key, key)
+
+    def _add(self, kind, section, key, text):
+        name_id = len(self.names)
+        grams = trigrams(text)
+        self.names.append((kind, section, key))
+        self.sizes.append(len(grams))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(name_id)
+
+    def suggest(self, text, kind=None, limit=5, min_score=0.3):
+        """
+        Return up to limit (score, kind, section, key, models) candidates for a name
+
+        kind restricts the candidates to "section" or "key" names. Exact
+        matches are left out since they need no suggestion.
+        """
+        grams = trigrams(text)
+        shared = {}
+        for gram in grams:
+            for name_id in self.postings.get(gram, ()):
+                shared[name_id] = shared.get(name_id, 0) + 1
+
+        candidates = []
+        for name_id, count in shared.items():
+            name_kind, section, key = self.names[name_id]
+            if kind and name_kind != kind:
+                continue
+            if (key if name_kind == "key" else section) == text:
+                continue
+            score = 2 * count / (len(grams) + self.sizes[name_id])
+            if score >= min_score:
+                if name_kind == "key":
+                    models = self.section_index.models_with_key(section, key)
+                else:
+                    models = self.section_index.models_with_section(section)
+                candidates.append((score, name_kind, section, key, models))
+        candidates.sort(key=lambda candidate: (-candidate[0], -len(candidate[4])))
+        return candidates[:limit]
+
+
+class StringTable:
+    """Interned strings addressed by small integer ids"""
+    __slots__ = ("ids", "strings")
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, text):
+        string_id = self.ids.get(text)
+        if string_id is None:
+            # One interned object serves as both key and value
+            text = sys.intern(text)
+            string_id = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def __getitem__(self, string_id):
+        return self.strings[string_id]
+
+    def __len__(self):
+        return len(self.strings)
+
+    def footprint(self):
+        """Approximate bytes held by the table"""
+        return (sys.getsizeof(self.ids) + sys.getsizeof(self.strings)
+                + sum(sys.getsizeof(text) for text in self.strings))
+
+
+class CompactCorpus:
+    """
+    Parsed configs of one or more roots held in a few flat arrays
+
+    Section names, keys and values repeat across thousands of models, so each
+    distinct string is stored once in a StringTable and rows are kept as
+    parallel arrays of string ids and line offsets. Whole sections repeat
+    too, so rows are stored per distinct section block, keyed by
+    section_hash(), and files only list the blocks they use:
+
+        file n   -> file_blocks[file_offsets[n]:file_offsets[n + 1]]
+        block b  -> rows[block_offsets[b]:block_offsets[b + 1]]
+
+    A block shared by many models is parsed and stored once. Row line numbers
+    are relative to the section header, whose line is kept per file.
+    This keeps every configured root resident for a small fraction of the
+    memory a dict per row needs.
+    """
+    __slots__ = ("strings", "roots", "models", "file_roots", "file_offsets",
+                 "file_blocks", "file_block_lines", "block_ids", "block_offsets",
+                 "row_sections", "row_keys", "row_values", "row_lines")
+
+    def __init__(self):
+        self.strings = StringTable()
+        self.roots = []  # root paths, by root number
+        self.models = []  # model string ids, by file number
+        self.file_roots = array('I')  # root number, by file number
+        self.file_offsets = array('I', [0])
+        self.file_blocks = array('I')  # block ids used by each file, in order
+        self.file_block_lines = array('I')  # header line of each of those blocks
+        self.block_ids = {}  # section_hash -> block id
+        self.block_offsets = array('I', [0])
+        self.row_sections = array('I')
+        self.row_keys = array('I')
+        self.row_values = array('I')
+        self.row_lines = array('I')
+
+    def __len__(self):
+        return len(self.models)
+
+    @property
+    def block_count(self):
+        return len(self.block_offsets) - 1
+
+    def _add_block(self, section, body):
+        """Return the block id for a section body, parsing it only if it is new"""
+        digest = section_hash(body)
+        block_id = self.block_ids.get(digest)
+        if block_id is None:
+            intern = self.strings.intern
+            section_id = intern(section)
+            for key, value, offset in parse_entries(body, 0):
+                self.row_sections.append(section_id)
+                self.row_keys.append(intern(key))
+                self.row_values.append(intern(value))
+                self.row_lines.append(offset)
+            block_id = self.block_ids[digest] = self.block_count
+            self.block_offsets.append(len(self.row_keys))
+        return block_id
+
+    def add_file(self, root_number, model, text):
+        for section, line, body in parse_sections(text):
+            self.file_blocks.append(self._add_block(section, body))
+            self.file_block_lines.append(line)
+        self.models.append(self.strings.intern(model))
+        self.file_roots.append(root_number)
+        self.file_offsets.append(len(self.file_blocks))
+
+    def load_directory(self, directory, recursive=False):
+        """Parse every config under a directory into the corpus"""
+        root_number = len(self.roots)
+        self.roots.append(os.path.abspath(directory))
+        for model, path in walk_configs(directory, recursive):
+            self.add_file(root_number, model, read_config(path))
+        return self
+
+    def rows(self, file_number):
+        """Yield the (section, key, value, line) rows of one file"""
+        strings = self.strings.strings
+        for position in range(self.file_offsets[file_number], self.file_offsets[file_number + 1]):
+            block_id = self.file_blocks[position]
+            header_line = self.file_block_lines[position]
+            for row in range(self.block_offsets[block_id], self.block_offsets[block_id + 1]):
+                yield (strings[self.row_sections[row]], strings[self.row_keys[row]],
+                       strings[self.row_values[row]], header_line + self.row_lines[row])
+
+    def row_count(self):
+        """Rows as seen by the files, counting shared blocks once per file"""
+        return sum(self.block_offsets[block_id + 1] - self.block_offsets[block_id]
+                   for block_id in self.file_blocks)
+
+    def footprint(self):
+        """Approximate bytes used, by component"""
+        def array_bytes(*arrays):
+            return sum(sys.getsizeof(values) for values in arrays)
+
+        return {
+            "strings": self.strings.footprint(),
+            "rows": array_bytes(self.row_sections, self.row_keys, self.row_values, self.row_lines),
+            "sections": (array_bytes(self.block_offsets, self.file_blocks, self.file_block_lines)
+                         + sys.getsizeof(self.block_ids)
+                         + sum(sys.getsizeof(digest) for digest in self.block_ids)),
+            "files": (array_bytes(self.file_roots, self.file_offsets) + sys.getsizeof(self.models)
+                      + sys.getsizeof(self.roots) + sum(sys.getsizeof(root) for root in self.roots)),
+        }
+
+
+def format_bytes(size):
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+def report_footprint(directories, recursive=False, budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+    """Load directories into a CompactCorpus and print its memory use"""
+    corpus = CompactCorpus()
+    print(f"{BLUE}Corpus Footprint:{NC}")
+    print(SEPARATOR)
+    for directory in directories:
+        if not os.path.isdir(directory):
+            print(f"{RED}✗ {directory}: Directory does not exist{NC}")
+            continue
+        files_before, rows_before = len(corpus), corpus.row_count()
+        corpus.load_directory(directory, recursive)
+        print(f"{GREEN}✓ {directory}{NC}: {len(corpus) - files_before} files, "
+              f"{corpus.row_count() - rows_before} rows")
+    print(SEPARATOR)
+
+    footprint = corpus.footprint()
+    total = sum(footprint.values())
+    print(f"Files: {YELLOW}{len(corpus)}{NC}")
+    print(f"Rows: {YELLOW}{corpus.row_count()}{NC} ({len(corpus.row_keys)} stored)")
+    print(f"Sections: {YELLOW}{len(corpus.file_blocks)}{NC} ({corpus.block_count} distinct)")
+    print(f"Distinct strings: {YELLOW}{len(corpus.strings)}{NC}")
+    for component, size in footprint.items():
+        print(f"Memory ({component}): {YELLOW}{format_bytes(size)}{NC}")
+    print(f"Memory (total): {YELLOW}{format_bytes(total)}{NC} of {format_bytes(budget_mb * 1024 * 1024)} budget")
+    if total > budget_mb * 1024 * 1024:
+        print(f"{RED}Corpus exceeds the memory budget.{NC}")
+        return 1
+    return 0
+
+
+def report_suggestions(directory, name, kind=None, limit=5):
+    """
+    Print ranked "did you mean" candidates for a name
+
+    Nothing is suggested for a name that exists as given, since the miss was
+    then caused by something else, such as the value searched for.
+    """
+    index = SectionIndex(directory).refresh()
+    if kind == "section" and name in index.sections:
+        return 1
+    if kind == "key" and index.models_with_key(None, name):
+        return 1
+    suggestions = NameIndex(index).suggest(name, kind, limit)
+    if not suggestions:
+        return 1
+    print(f"{YELLOW}Did you mean:{NC}")
+    for _score, name_kind, section, key, models in suggestions:
+        shown = ", ".join(sorted(models)[:5]) + (", ..." if len(models) > 5 else "")
+        label = f"[{section}]" if name_kind == "section" else f"[{section}].{key}"
+        print(f"  {label} ({len(models)} models: {shown})")
+    return 0
+
+
+def report_section_groups(directory, section, recursive=False, include=(), exclude=()):
+    """Print a section across all models, showing each distinct copy once"""
+    configs = walk_configs(directory, recursive, include, exclude)
+    groups, missing = group_sections(configs, section)
+
+    print()
+    print(f"{BLUE}Search Results:{NC}")
+    print(SEPARATOR)
+    if not groups:
+        print(f"{RED}Section [{section}] not found in any searched files.{NC}")
+        if not (recursive or include or exclude):
+            report_suggestions(directory, section, "section")
+        print(SEPARATOR)
+    for body, models in groups:
+        if len(models) == 1:
+            print(f"{GREEN}✓ {models[0]}: Section [{section}] found{NC}")
+        else:
+            print(f"{GREEN}✓ Section [{section}] identical in {len(models)} models: {', '.join(models)}{NC}")
+        print(body)
+        print(SEPARATOR)
+
+    print(f"{BLUE}Summary:{NC}")
+    print(SEPARATOR)
+    print(f"Total files searched: {YELLOW}{len(configs)}{NC}")
+    print(f"Files with match: {YELLOW}{len(configs) - len(missing)}{NC}")
+    print(f"Distinct sections: {YELLOW}{len(groups)}{NC}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared helpers for reading .ini config trees")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    walk_parser = commands.add_parser("walk", help="List config files as NUL-terminated relative paths")
+    walk_parser.add_argument("directory")
+    walk_parser.add_argument("-r", "--recursive", action="store_true", help="Descend into subdirectories")
+    walk_parser.add_argument("-i", "--include", action="append", default=[], help="Only list files matching this glob")
+    walk_parser.add_argument("-x", "--exclude", action="append", default=[], help="Skip files and directories matching this glob")
+    walk_parser.add_argument("--workers", type=int, default=8, help="Directories scanned concurrently")
+
+    archive_parser = commands.add_parser("archive", help="Write the selected configs of an archive as NUL-terminated "
+                                                         "relative path and content pairs")
+    archive_parser.add_argument("archive")
+    archive_parser.add_argument("-r", "--recursive", action="store_true", help="Descend into subdirectories")
+    archive_parser.add_argument("-i", "--include", action="append", default=[], help="Only list files matching this glob")
+    archive_parser.add_argument("-x", "--exclude", action="append", default=[], help="Skip files and directories matching this glob")
+
+    footprint_parser = commands.add_parser("footprint", help="Report the memory needed to hold directories resident")
+    footprint_parser.add_argument("directories", nargs="+")
+    footprint_parser.add_argument("-r", "--recursive", action="store_true", help="Descend into subdirectories")
+    footprint_parser.add_argument("--budget", type=float, default=DEFAULT_MEMORY_BUDGET_MB,
+                                  help="Memory budget in MB (default: %(default)s)")
+
+    suggest_parser = commands.add_parser("suggest", help="Suggest section or key names close to a misspelled one")
+    suggest_parser.add_argument("directory")
+    suggest_parser.add_argument("name")
+    suggest_parser.add_argument("--kind", choices=["section", "key"], help="Only suggest this kind of name")
+    suggest_parser.add_argument("--limit", type=int, default=5, help="Maximum number of suggestions")
+
+    sections_parser = commands.add_parser("sections", help="Show a section across models, grouping identical copies")
+    sections_parser.add_argument("directory")
+    sections_parser.add_argument("section")
+    sections_parser.add_argument("-r", "--recursive", action="store_true", help="Descend into subdirectories")
+    sections_parser.add_argument("-i", "--include", action="append", default=[], help="Only search files matching this glob")
+    sections_parser.add_argument("-x", "--exclude", action="append", default=[], help="Skip files and directories matching this glob")
+
+    args = parser.parse_args()
+
+    if args.command == "footprint":
+        return report_footprint(args.directories, args.recursive, args.budget)
+
+    if args.command == "archive":
+        try:
+            configs = read_archive_configs(args.archive, args.recursive, args.include, args.exclude)
+        except (OSError, EOFError, tarfile.TarError, zipfile.BadZipFile) as e:
+            print(f"{RED}Error: {e}{NC}", file=sys.stderr)
+            # An empty path tells the search script the archive could not be read
+            sys.stdout.write("\0\0")
+            return 1
+        for relative_model, text in configs:
+            sys.stdout.write(f"{relative_model}.ini\0{text}\0")
+        return 0
+
+    if not os.path.isdir(args.directory):
+        print(f"{RED}Error: Directory {args.directory} does not exist.{NC}", file=sys.stderr)
+        return 1
+
+    if args.command == "suggest":
+        return report_suggestions(args.directory, args.name, args.kind, args.limit)
+
+    if args.command == "sections":
+        return report_section_groups(args.directory, args.section, args.recursive,
+                                     args.include, args.exclude)
+
+    for relative_model, _path in walk_configs(args.directory, args.recursive, args.include,
+                                              args.exclude, args.workers):
+        sys.stdout.write(f"{relative_model}.ini\0")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
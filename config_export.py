@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Export parsed config trees to SQLite
+
+Every (root, model, section, key, value, line) row of one or more
+directories is loaded into an indexed SQLite database, so cross-model
+questions become SQL queries instead of loops around the search script:
+
+    SELECT value, COUNT(*) FROM entries
+    WHERE section = 'Proximity' AND key = 'Threshold' GROUP BY value;
+
+Rows are inserted in batches inside one transaction per export, and a file
+is only re-parsed when its mtime or size changed since the last export.
+Models whose files disappeared are removed.
+
+Usage:
+    config_export.py <directory>... [--db PATH] [-r]
+    config_export.py --db PATH --sql "SELECT ..."
+"""
+import argparse
+import os
+import sqlite3
+import sys
+
+from config_corpus import (CACHE_DIR, GREEN, NC, RED, SEPARATOR, YELLOW,
+                           parse_entries, parse_sections, read_config,
+                           walk_configs)
+
+DEFAULT_DATABASE = os.path.join(CACHE_DIR, "corpus.sqlite")
+
+# Rows handed to executemany at a time
+BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    root TEXT NOT NULL,
+    model TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (root, model)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    root TEXT NOT NULL,
+    model TEXT NOT NULL,
+    section TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_model ON entries (root, model);
+CREATE INDEX IF NOT EXISTS entries_section_key ON entries (section, key, value);
+CREATE INDEX IF NOT EXISTS entries_key ON entries (key, value);
+"""
+
+
+def connect(database=DEFAULT_DATABASE):
+    """Open (and create if needed) an export database"""
+    directory = os.path.dirname(database)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(database)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _insert_batched(connection, sql, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            connection.executemany(sql, batch)
+            batch = []
+    if batch:
+        connection.executemany(sql, batch)
+
+
+def export_directory(connection, directory, recursive=False):
+    """
+    Bring a directory's rows in the database up to date
+
+    Returns (files_exported, files_unchanged, files_removed).
+    """
+    root = os.path.abspath(directory)
+    known = {model: (mtime, size) for model, mtime, size in
+             connection.execute("SELECT model, mtime, size FROM files WHERE root = ?", (root,))}
+
+    changed = []
+    unchanged = 0
+    configs = walk_configs(root, recursive)
+    for model, path in configs:
+        stat = os.stat(path)
+        if known.get(model) == (stat.st_mtime_ns, stat.st_size):
+            unchanged += 1
+        else:
+            changed.append((model, path, stat))
+    removed = set(known) - {model for model, _path in configs}
+
+    def changed_rows():
+        for model, path, _stat in changed:
+            for section, line, body in parse_sections(read_config(path)):
+                for key, value, entry_line in parse_entries(body, line):
+                    yield root, model, section, key, value, entry_line
+
+    with connection:
+        stale = [(root, model) for model in removed] + [(root, model) for model, _path, _stat in changed]
+        connection.executemany("DELETE FROM entries WHERE root = ? AND model = ?", stale)
+        connection.executemany("DELETE FROM files WHERE root = ? AND model = ?", stale)
+        _insert_batched(connection, "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)", changed_rows())
+        connection.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                               [(root, model, path, stat.st_mtime_ns, stat.st_size)
+                                for model, path, stat in changed])
+    return len(changed), unchanged, len(removed)
+
+
+def run_sql(connection, sql, limit=None):
+    """Run a query and return (column names, rows), reading at most limit rows"""
+    cursor = connection.execute(sql)
+    columns = [description[0] for description in cursor.description or []]
+    rows = cursor.fetchmany(limit) if limit else cursor.fetchall()
+    return columns, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export parsed config trees to SQLite")
+    parser.add_argument("directories", nargs="*", help="Config directories to export")
+    parser.add_argument("--db", default=DEFAULT_DATABASE, help="Database path")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Descend into subdirectories")
+    parser.add_argument("--sql", help="Run a query against the database after exporting")
+    args = parser.parse_args()
+
+    if not args.directories and not args.sql:
+        parser.error("give at least one directory or --sql")
+
+    connection = connect(args.db)
+    status = 0
+
+    for directory in args.directories:
+        if not os.path.isdir(directory):
+            print(f"{RED}Error: Directory {directory} does not exist.{NC}", file=sys.stderr)
+            status = 1
+            continue
+        exported, unchanged, removed = export_directory(connection, directory, args.recursive)
+        print(f"{GREEN}✓ {directory} exported to {args.db}{NC}")
+        print(f"Files exported: {YELLOW}{exported}{NC}")
+        print(f"Files unchanged: {YELLOW}{unchanged}{NC}")
+        print(f"Files removed: {YELLOW}{removed}{NC}")
+        print(SEPARATOR)
+
+    if args.sql:
+        try:
+            columns, rows = run_sql(connection, args.sql)
+        except sqlite3.Error as e:
+            print(f"{RED}Error: {e}{NC}", file=sys.stderr)
+            return 1
+        print("\t".join(columns))
+        for row in rows:
+            print("\t".join("" if value is None else str(value) for value in row))
+
+    connection.close()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Versioned history of config trees
+
+Each snapshot records the state of a directory of .ini files. Content is
+stored once, addressed by its SHA-1:
+
+    <store>/objects/ab/cdef...                  section bodies and per-file section lists
+    <store>/snapshots/<root>/<time>.json         manifest: model -> mtime, size, file digest
+    <store>/snapshots/<root>/models/<model>.log  snapshots where the model's file digest changed
+
+A file whose mtime and size match the previous snapshot is not read again,
+and an unchanged section is never stored twice, so daily snapshots of
+thousands of configs cost little time and space. Change queries walk the
+model's log rather than every manifest, compare digests first and only
+parse sections whose content actually changed.
+
+Usage:
+    config_history.py snapshot <directory> [--store PATH]
+    config_history.py changes <directory> <model> <section> <key>
+                      [--since YYYY-MM-DD] [--until YYYY-MM-DD] [--store PATH]
+
+--until includes the whole day when given as a bare date. The directory of
+a changes query is only the key of its history, so it may since have been
+moved or deleted.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import date, datetime, time
+
+from config_corpus import (BLUE, DATA_DIR, GREEN, NC, RED, SEPARATOR, YELLOW,
+                           list_configs, parse_entries, parse_sections,
+                           read_config)
+
+DEFAULT_STORE = os.path.join(DATA_DIR, "history")
+
+# Snapshot file names sort in time order, which keeps range queries cheap.
+# Snapshots taken within the same second get a -001, -002... suffix.
+TIME_FORMAT = "%Y%m%dT%H%M%S"
+TIME_LENGTH = len("YYYYmmddTHHMMSS")
+
+
+class HistoryStore:
+    """Content-addressed snapshot store for one or more config roots"""
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        self.objects_dir = os.path.join(path, "objects")
+        self.snapshots_dir = os.path.join(path, "snapshots")
+        self._object_cache = {}
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def put_object(self, data):
+        """Store text once and return its digest"""
+        digest = hashlib.sha1(data.encode('utf-8')).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            self._write_atomic(path, data)
+        return digest
+
+    def get_object(self, digest):
+        if digest not in self._object_cache:
+            with open(self._object_path(digest), 'r', encoding='utf-8') as f:
+                self._object_cache[digest] = f.read()
+        return self._object_cache[digest]
+
+    def _root_dir(self, root):
+        """Snapshot directory for a config root, keyed by its absolute path"""
+        root = os.path.abspath(root)
+        return os.path.join(self.snapshots_dir, hashlib.sha1(root.encode('utf-8')).hexdigest()[:16])
+
+    def snapshot_names(self, root, since=None, until=None):
+        """Sorted snapshot names for a root, optionally limited to a time range"""
+        root_dir = self._root_dir(root)
+        if not os.path.isdir(root_dir):
+            return []
+        names = sorted(name[:-5] for name in os.listdir(root_dir) if name.endswith('.json'))
+        if since:
+            names = [name for name in names if name[:TIME_LENGTH] >= since.strftime(TIME_FORMAT)]
+        if until:
+            names = [name for name in names if name[:TIME_LENGTH] <= until.strftime(TIME_FORMAT)]
+        return names
+
+    def load_snapshot(self, root, name):
+        with open(os.path.join(self._root_dir(root), f"{name}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _log_path(self, root, model):
+        digest = hashlib.sha1(model.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self._root_dir(root), "models", f"{digest}.log")
+
+    def _append_log(self, root, model, name, file_digest):
+        path = self._log_path(root, model)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps([name, file_digest]) + "\n")
+
+    def _log_changes(self, root, name, previous, files):
+        """Record in each model's log that its file changed, appeared or vanished in snapshot name"""
+        for model, entry in files.items():
+            known = previous.get(model)
+            if not known or known["digest"] != entry["digest"]:
+                self._append_log(root, model, name, entry["digest"])
+        for model in previous.keys() - files.keys():
+            self._append_log(root, model, name, None)
+
+    def _ensure_logs(self, root):
+        """Build the model logs of a store written before they existed, once"""
+        names = self.snapshot_names(root)
+        if not names or os.path.isdir(os.path.join(self._root_dir(root), "models")):
+            return
+        previous = {}
+        for name in names:
+            files = self.load_snapshot(root, name)["files"]
+            self._log_changes(root, name, previous, files)
+            previous = files
+        os.makedirs(os.path.join(self._root_dir(root), "models"), exist_ok=True)
+
+    def model_log(self, root, model):
+        """Sorted (snapshot name, file digest or None) points where a model's file changed"""
+        try:
+            with open(self._log_path(root, model), 'r', encoding='utf-8') as f:
+                return sorted(tuple(json.loads(line)) for line in f if line.strip())
+        except FileNotFoundError:
+            return []
+
+    def take_snapshot(self, root, taken=None):
+        """
+        Record the current state of a config root
+
+        Returns (name, files_read, files_total). Files whose mtime and size are
+        unchanged since the latest snapshot reuse its digest without being read.
+        """
+        root = os.path.abspath(root)
+        taken = taken or datetime.now()
+        self._ensure_logs(root)
+        names = self.snapshot_names(root)
+        previous = self.load_snapshot(root, names[-1])["files"] if names else {}
+
+        files = {}
+        files_read = 0
+        for model, path in list_configs(root):
+            stat = os.stat(path)
+            known = previous.get(model)
+            if known and known["mtime"] == stat.st_mtime_ns and known["size"] == stat.st_size:
+                files[model] = known
+                continue
+
+            sections = [[name, line, self.put_object(body)]
+                        for name, line, body in parse_sections(read_config(path))]
+            files[model] = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": self.put_object(json.dumps(sections)),
+            }
+            files_read += 1
+
+        name = taken.strftime(TIME_FORMAT)
+        suffix = 0
+        while os.path.exists(os.path.join(self._root_dir(root), f"{name}.json")):
+            suffix += 1
+            name = f"{taken.strftime(TIME_FORMAT)}-{suffix:03d}"
+        manifest = {"root": root, "taken": taken.isoformat(timespec='seconds'), "files": files}
+        # Logs first: an entry whose manifest was never written is ignored by queries
+        self._log_changes(root, name, previous, files)
+        self._write_atomic(os.path.join(self._root_dir(root), f"{name}.json"), json.dumps(manifest))
+        return name, files_read, len(files)
+
+    def _section_digest(self, file_digest, section):
+        for name, _line, digest in json.loads(self.get_object(file_digest)):
+            if name == section:
+                return digest
+        return None
+
+    def value_changes(self, root, model, section, key, since=None, until=None):
+        """
+        Return the (taken, value) points where a key's value changed
+
+        value is None while the model, section or key is missing. The first
+        snapshot in the range is always reported so the starting value is known.
+        Only the model's log is read, never the manifests.
+        """
+        self._ensure_logs(root)
+        names = self.snapshot_names(root, since, until)
+        if not names:
+            return []
+        existing = set(self.snapshot_names(root))
+
+        # The file at the first snapshot in range is the last one logged before it
+        start_digest = None
+        points = []
+        for name, logged_digest in self.model_log(root, model):
+            if name not in existing:
+                continue
+            if name <= names[0]:
+                start_digest = logged_digest
+            elif name <= names[-1]:
+                points.append((name, logged_digest))
+        points.insert(0, (names[0], start_digest))
+
+        changes = []
+        file_digest = section_digest = None
+        value = ()  # Sentinel that differs from every real value, including None
+        for name, new_file_digest in points:
+            if changes and new_file_digest == file_digest:
+                continue
+            file_digest = new_file_digest
+
+            new_section_digest = self._section_digest(file_digest, section) if file_digest else None
+            if changes and new_section_digest == section_digest:
+                continue
+            section_digest = new_section_digest
+
+            new_value = None
+            if section_digest:
+                for entry_key, entry_value, _line in parse_entries(self.get_object(section_digest)):
+                    if entry_key == key:
+                        new_value = entry_value
+                        break
+            if new_value != value:
+                value = new_value
+                taken = datetime.strptime(name[:TIME_LENGTH], TIME_FORMAT)
+                changes.append((taken.isoformat(), value))
+        return changes
+
+
+def parse_date(text):
+    return datetime.fromisoformat(text)
+
+
+def parse_end_date(text):
+    """Like parse_date, but a bare date includes the whole day"""
+    if len(text) == len("YYYY-MM-DD"):
+        return datetime.combine(date.fromisoformat(text), time.max)
+    return parse_date(text)
+
+
+def main():
+    # --store is accepted before or after the command
+    store_parser = argparse.ArgumentParser(add_help=False)
+    store_parser.add_argument("--store", default=argparse.SUPPRESS, help="History store location")
+
+    parser = argparse.ArgumentParser(description="Versioned history of config trees", parents=[store_parser])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = commands.add_parser("snapshot", parents=[store_parser],
+                                          help="Record the current state of a directory")
+    snapshot_parser.add_argument("directory")
+
+    changes_parser = commands.add_parser("changes", parents=[store_parser],
+                                         help="Show when a key's value changed")
+    changes_parser.add_argument("directory")
+    changes_parser.add_argument("model")
+    changes_parser.add_argument("section")
+    changes_parser.add_argument("key")
+    changes_parser.add_argument("--since", type=parse_date, help="Start date (YYYY-MM-DD[THH:MM:SS])")
+    changes_parser.add_argument("--until", type=parse_end_date,
+                                help="End date, inclusive (YYYY-MM-DD[THH:MM:SS])")
+
+    args = parser.parse_args()
+    store = HistoryStore(getattr(args, "store", DEFAULT_STORE))
+
+    if args.command == "snapshot":
+        if not os.path.isdir(args.directory):
+            print(f"{RED}Error: Directory {args.directory} does not exist.{NC}", file=sys.stderr)
+            return 1
+        name, files_read, files_total = store.take_snapshot(args.directory)
+        print(f"{GREEN}✓ Snapshot {name} recorded{NC}")
+        print(f"Files in snapshot: {YELLOW}{files_total}{NC}")
+        print(f"Files read (new or changed): {YELLOW}{files_read}{NC}")
+        return 0
+
+    print(f"{BLUE}Value History:{NC}")
+    print(SEPARATOR)
+    print(f"Model: {YELLOW}{args.model}{NC}")
+    print(f"Section: {YELLOW}[{args.section}]{NC}")
+    print(f"Key: {YELLOW}{args.key}{NC}")
+    print(SEPARATOR)
+    changes = store.value_changes(args.directory, args.model, args.section, args.key,
+                                  args.since, args.until)
+    if not changes:
+        print(f"{RED}No snapshots found for {args.directory} in this range.{NC}")
+        return 1
+    for taken, value in changes:
+        if value is None:
+            print(f"{taken}  {RED}(not set){NC}")
+        else:
+            print(f"{taken}  {args.key} = {GREEN}{value}{NC}")
+    print(SEPARATOR)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Rule-based linting of config trees
+
+A rules file lists section/key constraints that every model must meet:
+
+    {"rules": [
+        {"id": "proximity-section", "section": "Proximity", "required": true,
+         "models": ["a0*"]},
+        {"id": "proximity-threshold", "section": "Proximity", "key": "Threshold",
+         "required": true, "min": 1, "max": 10},
+        {"id": "topbar", "section": "General", "key": "EnableTopBar",
+         "one_of": ["True", "False"], "severity": "warning"}
+    ]}
+
+Rule fields:
+    id            name reported with each violation (required)
+    section       section the rule is about (required)
+    key           key the rule is about; without it the rule is about the section
+    required      the section, or the key within the section, must be present
+    forbidden     the section or key must not be present
+    equals        the value must be exactly this
+    one_of        the value must be one of these
+    pattern       the value must match this regex
+    min, max      the value must be a number within these bounds
+    when_section  only check models that have this section
+    models        only check models matching one of these globs
+    severity      "error" (default) or "warning"
+    message       text reported instead of the generated description
+
+A key rule only applies to models that have its section; use a section rule
+with "required" to demand the section itself. Rules files may be JSON, or
+YAML when PyYAML is installed.
+
+All rules are compiled into one matcher keyed by section and key, and every
+model is parsed once, so hundreds of rules cost a single pass over the tree.
+
+Usage:
+    config_lint.py <directory> <rules file> [-r] [--format text|ndjson]
+"""
+import argparse
+import fnmatch
+import json
+import re
+import sys
+
+from config_corpus import (BLUE, GREEN, NC, RED, SEPARATOR, YELLOW,
+                           parse_entries, parse_sections, read_config,
+                           walk_configs)
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+SEVERITIES = ("error", "warning")
+
+
+class RuleError(ValueError):
+    """Raised for a rules file that cannot be compiled"""
+
+
+class Rule:
+    """One compiled constraint"""
+    __slots__ = ("id", "section", "key", "required", "forbidden", "equals", "one_of",
+                 "pattern", "minimum", "maximum", "when_section", "models", "severity",
+                 "message")
+
+    def __init__(self, spec):
+        if not isinstance(spec, dict):
+            raise RuleError(f"Rule must be a mapping, got {spec!r}")
+        unknown = set(spec) - {"id", "section", "key", "required", "forbidden", "equals", "one_of",
+                               "pattern", "min", "max", "when_section", "models", "severity", "message"}
+        if unknown:
+            raise RuleError(f"Rule {spec.get('id', '?')}: unknown fields {', '.join(sorted(unknown))}")
+        for field in ("id", "section"):
+            if not spec.get(field):
+                raise RuleError(f"Rule {spec.get('id', '?')}: missing {field!r}")
+
+        self.id = str(spec["id"])
+        self._check_types(spec)
+        self.section = str(spec["section"])
+        self.key = str(spec["key"]) if spec.get("key") else None
+        self.required = bool(spec.get("required", False))
+        self.forbidden = bool(spec.get("forbidden", False))
+        self.equals = str(spec["equals"]) if "equals" in spec else None
+        self.one_of = frozenset(str(value) for value in spec["one_of"]) if "one_of" in spec else None
+        self.minimum = spec.get("min")
+        self.maximum = spec.get("max")
+        self.when_section = spec.get("when_section")
+        self.models = spec.get("models")
+        self.severity = spec.get("severity", "error")
+        self.message = spec.get("message")
+
+        if self.required and self.forbidden:
+            raise RuleError(f"Rule {self.id}: 'required' and 'forbidden' cannot both be set")
+        if self.severity not in SEVERITIES:
+            raise RuleError(f"Rule {self.id}: severity must be one of {', '.join(SEVERITIES)}")
+        try:
+            self.pattern = re.compile(spec["pattern"]) if "pattern" in spec else None
+        except re.error as e:
+            raise RuleError(f"Rule {self.id}: invalid pattern: {e}")
+        has_value_checks = any(check is not None for check in
+                               (self.equals, self.one_of, self.pattern, self.minimum, self.maximum))
+        if self.key is None and has_value_checks:
+            raise RuleError(f"Rule {self.id}: value checks need a 'key'")
+        if not (self.required or self.forbidden or has_value_checks):
+            raise RuleError(f"Rule {self.id}: nothing to check")
+
+    def _check_types(self, spec):
+        """Raise RuleError for fields of the wrong type, before they fail at check time"""
+        for field in ("required", "forbidden"):
+            if field in spec and not isinstance(spec[field], bool):
+                raise RuleError(f"Rule {self.id}: {field!r} must be true or false")
+        for field in ("min", "max"):
+            value = spec.get(field)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                raise RuleError(f"Rule {self.id}: {field!r} must be a number")
+        for field in ("one_of", "models"):
+            if field in spec and not isinstance(spec[field], list):
+                raise RuleError(f"Rule {self.id}: {field!r} must be a list")
+        for field in ("pattern", "when_section", "message"):
+            if field in spec and not isinstance(spec[field], str):
+                raise RuleError(f"Rule {self.id}: {field!r} must be a string")
+
+    def applies_to(self, model, sections):
+        if self.when_section is not None and self.when_section not in sections:
+            return False
+        if self.models and not any(fnmatch.fnmatchcase(model, glob) for glob in self.models):
+            return False
+        return True
+
+    def check_value(self, value):
+        """Return a description of what is wrong with a value, or None"""
+        if self.forbidden:
+            return "must not be set"
+        if self.equals is not None and value != self.equals:
+            return f"must be {self.equals}"
+        if self.one_of is not None and value not in self.one_of:
+            return f"must be one of {', '.join(sorted(self.one_of))}"
+        if self.pattern is not None and not self.pattern.search(value):
+            return f"must match {self.pattern.pattern}"
+        if self.minimum is not None or self.maximum is not None:
+            try:
+                number = float(value)
+            except ValueError:
+                return "must be a number"
+            if self.minimum is not None and number < self.minimum:
+                return f"must be at least {self.minimum}"
+            if self.maximum is not None and number > self.maximum:
+                return f"must be at most {self.maximum}"
+        return None
+
+
+class Violation:
+    __slots__ = ("rule", "model", "value", "line", "problem")
+
+    def __init__(self, rule, model, value, line, problem):
+        self.rule = rule
+        self.model = model
+        self.value = value
+        self.line = line
+        self.problem = problem
+
+    @property
+    def message(self):
+        if self.rule.message:
+            return self.rule.message
+        target = f"[{self.rule.section}]"
+        if self.rule.key:
+            target += f".{self.rule.key}"
+        return f"{target} {self.problem}"
+
+    def as_dict(self):
+        return {
+            "rule": self.rule.id,
+            "severity": self.rule.severity,
+            "model": self.model,
+            "section": self.rule.section,
+            "key": self.rule.key,
+            "value": self.value,
+            "line": self.line,
+            "message": self.message,
+        }
+
+
+class RuleSet:
+    """
+    All rules compiled into one matcher
+
+    Rules are grouped by section, and within a section by key, so checking a
+    model is one dictionary lookup per rule target rather than a search of
+    the file per rule.
+    """
+
+    def __init__(self, specs):
+        self.rules = [Rule(spec) for spec in specs]
+        ids = [rule.id for rule in self.rules]
+        duplicates = {rule_id for rule_id in ids if ids.count(rule_id) > 1}
+        if duplicates:
+            raise RuleError(f"Duplicate rule ids: {', '.join(sorted(duplicates))}")
+
+        self.section_rules = {}  # section -> rules about the section itself
+        self.key_rules = {}  # section -> key -> rules about the key
+        for rule in self.rules:
+            if rule.key is None:
+                self.section_rules.setdefault(rule.section, []).append(rule)
+            else:
+                self.key_rules.setdefault(rule.section, {}).setdefault(rule.key, []).append(rule)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except UnicodeDecodeError as e:
+            raise RuleError(f"{path} is not UTF-8: {e}")
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise RuleError("YAML rules files need PyYAML (pip install pyyaml); use JSON instead")
+            try:
+                data = yaml.safe_load(text)
+            except yaml.YAMLError as e:
+                raise RuleError(f"Invalid YAML in {path}: {e}")
+        else:
+            try:
+                data = json.loads(text)
+            except ValueError as e:
+                raise RuleError(f"Invalid JSON in {path}: {e}")
+        if isinstance(data, dict):
+            data = data.get("rules")
+        if not isinstance(data, list):
+            raise RuleError(f"{path} must contain a list of rules")
+        return cls(data)
+
+    def check(self, model, text):
+        """Return the violations of one model's config text"""
+        sections = {}
+        for name, line, body in parse_sections(text):
+            entries = sections.setdefault(name, {"line": line, "keys": {}})["keys"]
+            for key, value, entry_line in parse_entries(body, line):
+                # The first occurrence wins, as with the search script's grep
+                entries.setdefault(key, (value, entry_line))
+
+        violations = []
+        for section, rules in self.section_rules.items():
+            present = section in sections
+            for rule in rules:
+                if not rule.applies_to(model, sections):
+                    continue
+                if rule.required and not present:
+                    violations.append(Violation(rule, model, None, None, "is missing"))
+                elif rule.forbidden and present:
+                    violations.append(Violation(rule, model, None, sections[section]["line"], "must not be present"))
+
+        for section, keys in self.key_rules.items():
+            if section not in sections:
+                continue
+            entries = sections[section]["keys"]
+            for key, rules in keys.items():
+                entry = entries.get(key)
+                for rule in rules:
+                    if not rule.applies_to(model, sections):
+                        continue
+                    if entry is None:
+                        if rule.required:
+                            violations.append(Violation(rule, model, None, sections[section]["line"], "is missing"))
+                        continue
+                    problem = rule.check_value(entry[0])
+                    if problem:
+                        violations.append(Violation(rule, model, entry[0], entry[1], problem))
+        return violations
+
+
+def lint_directory(rule_set, directory, recursive=False):
+    """Check every config under a directory; return (files checked, violations)"""
+    violations = []
+    configs = walk_configs(directory, recursive)
+    for model, path in configs:
+        violations.extend(rule_set.check(model, read_config(path)))
+    return len(configs), violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rule-based linting of config trees")
+    parser.add_argument("directory")
+    parser.add_argument("rules", help="Rules file (JSON, or YAML with PyYAML installed)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Descend into subdirectories")
+    parser.add_argument("--format", choices=["text", "ndjson"], default="text", help="Report format")
+    args = parser.parse_args()
+
+    try:
+        rule_set = RuleSet.load(args.rules)
+        files_checked, violations = lint_directory(rule_set, args.directory, args.recursive)
+    except (RuleError, OSError) as e:
+        print(f"{RED}Error: {e}{NC}", file=sys.stderr)
+        return 2
+
+    errors = sum(1 for violation in violations if violation.rule.severity == "error")
+
+    if args.format == "ndjson":
+        for violation in violations:
+            print(json.dumps(violation.as_dict()))
+        return 1 if errors else 0
+
+    print()
+    print(f"{BLUE}Lint Results:{NC}")
+    print(SEPARATOR)
+    if violations:
+        for violation in violations:
+            color = RED if violation.rule.severity == "error" else YELLOW
+            location = f":{violation.line}" if violation.line else ""
+            print(f"{color}✗ {violation.model}{location}: {violation.message} ({violation.rule.id}){NC}")
+    else:
+        print(f"{GREEN}✓ All models pass {len(rule_set.rules)} rules{NC}")
+    print(SEPARATOR)
+
+    print(f"{BLUE}Summary:{NC}")
+    print(SEPARATOR)
+    print(f"Rules checked: {YELLOW}{len(rule_set.rules)}{NC}")
+    print(f"Total files searched: {YELLOW}{files_checked}{NC}")
+    print(f"Errors: {YELLOW}{errors}{NC}")
+    print(f"Warnings: {YELLOW}{len(violations) - errors}{NC}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
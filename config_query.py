@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Boolean queries over a directory of .ini configs
+
+A query combines predicates with AND, OR, NOT and parentheses:
+
+    [Section]                     the section is present
+    [Section].Key                 the key is set in the section
+    [Section].Key = value         the key has exactly this value
+    [Section].Key ~ regex         the key's value matches the regex
+    Key, Key = value, Key ~ regex the same, in any section
+
+Values and regexes containing spaces or parentheses can be quoted, e.g.
+[General].Name = "Galaxy A01" AND NOT ([Proximity] OR Threshold ~ "^[0-9]$").
+
+The planner answers section and key presence from the cached SectionIndex
+without opening any config. Value predicates are evaluated last within an
+AND, and only against models that survived the cheaper predicates and
+actually define the key, so file contents are read as rarely as possible.
+
+Usage:
+    config_query.py <directory> <query> [--model MODEL] [-r] [-i GLOB] [-x GLOB]
+"""
+import argparse
+import re
+import sys
+
+from config_corpus import (BLUE, GREEN, NC, RED, SEPARATOR, YELLOW,
+                           SectionIndex, parse_entries, parse_sections,
+                           read_config)
+
+
+class QueryError(ValueError):
+    """Raised for a query that cannot be parsed"""
+
+
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<lparen>\() |
+        (?P<rparen>\)) |
+        (?P<op>=|~) |
+        (?P<section>\[[^\]]+\](?:\.[^\s()=~"]+)?) |
+        "(?P<quoted>(?:[^"\\]|\\.)*)" |
+        (?P<word>[^\s()=~"]+)
+    )''', re.VERBOSE)
+
+KEYWORDS = {"AND", "OR", "NOT"}
+
+
+def tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if not match:
+            raise QueryError(f"Unexpected character at position {position}: {text[position:]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "word" and value.startswith("["):
+            raise QueryError(f"Missing closing ']' in {value!r}")
+        if kind == "quoted":
+            value = re.sub(r'\\(.)', r'\1', value)
+        elif kind == "word" and value.upper() in KEYWORDS:
+            kind, value = "keyword", value.upper()
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class Context:
+    """Index plus lazily parsed file contents shared by all predicates"""
+
+    def __init__(self, index):
+        self.index = index
+        self.entries_cache = {}
+
+    def entries(self, model):
+        """Return {section: [(key, value, line)]} for a model, reading its file once"""
+        if model not in self.entries_cache:
+            entries = {}
+            for name, line, body in parse_sections(read_config(self.index.paths[model])):
+                entries.setdefault(name, []).extend(parse_entries(body, line))
+            self.entries_cache[model] = entries
+        return self.entries_cache[model]
+
+    @property
+    def files_read(self):
+        return len(self.entries_cache)
+
+
+class SectionPredicate:
+    needs_content = False
+
+    def __init__(self, section):
+        self.section = section
+
+    def estimate(self, context):
+        return len(context.index.models_with_section(self.section))
+
+    def evaluate(self, context, candidates):
+        return candidates & context.index.models_with_section(self.section)
+
+    def __str__(self):
+        return f"[{self.section}]"
+
+
+class KeyPredicate:
+    needs_content = False
+
+    def __init__(self, section, key):
+        self.section = section
+        self.key = key
+
+    def estimate(self, context):
+        return len(context.index.models_with_key(self.section, self.key))
+
+    def evaluate(self, context, candidates):
+        return candidates & context.index.models_with_key(self.section, self.key)
+
+    def __str__(self):
+        return f"[{self.section}].{self.key}" if self.section is not None else self.key
+
+
+class ValuePredicate(KeyPredicate):
+    """Key equality or regex match; the only predicate that reads file contents"""
+    needs_content = True
+
+    def __init__(self, section, key, op, value):
+        super().__init__(section, key)
+        self.op = op
+        self.value = value
+        if op == "~":
+            try:
+                self.pattern = re.compile(value)
+            except re.error as e:
+                raise QueryError(f"Invalid regex {value!r}: {e}")
+
+    def matches(self, value):
+        if self.op == "=":
+            return value == self.value
+        return self.pattern.search(value) is not None
+
+    def evaluate(self, context, candidates):
+        # The index narrows the files to open down to those defining the key
+        matched = set()
+        for model in super().evaluate(context, candidates):
+            for section, entries in context.entries(model).items():
+                if self.section is not None and section != self.section:
+                    continue
+                if any(key == self.key and self.matches(value) for key, value, _line in entries):
+                    matched.add(model)
+                    break
+        return matched
+
+    def __str__(self):
+        return f"{KeyPredicate.__str__(self)} {self.op} {self.value}"
+
+
+class Not:
+    def __init__(self, operand):
+        self.operand = operand
+        self.needs_content = operand.needs_content
+
+    def estimate(self, context):
+        return len(context.index.files) - self.operand.estimate(context)
+
+    def evaluate(self, context, candidates):
+        return candidates - self.operand.evaluate(context, candidates)
+
+    def __str__(self):
+        return f"NOT {self.operand}"
+
+
+class And:
+    def __init__(self, operands):
+        self.operands = operands
+        self.needs_content = any(operand.needs_content for operand in operands)
+
+    def estimate(self, context):
+        return min(operand.estimate(context) for operand in self.operands)
+
+    def evaluate(self, context, candidates):
+        # Index-only predicates first, then the most selective, so content
+        # predicates only see the candidates that are left
+        plan = sorted(self.operands, key=lambda operand: (operand.needs_content, operand.estimate(context)))
+        for operand in plan:
+            if not candidates:
+                break
+            candidates = operand.evaluate(context, candidates)
+        return candidates
+
+    def __str__(self):
+        return "(" + " AND ".join(str(operand) for operand in self.operands) + ")"
+
+
+class Or:
+    def __init__(self, operands):
+        self.operands = operands
+        self.needs_content = any(operand.needs_content for operand in operands)
+
+    def estimate(self, context):
+        return min(len(context.index.files), sum(operand.estimate(context) for operand in self.operands))
+
+    def evaluate(self, context, candidates):
+        # Cheap, broad predicates first; later ones only test what is still unmatched
+        plan = sorted(self.operands, key=lambda operand: (operand.needs_content, -operand.estimate(context)))
+        matched = set()
+        for operand in plan:
+            remaining = candidates - matched
+            if not remaining:
+                break
+            matched |= operand.evaluate(context, remaining)
+        return matched
+
+    def __str__(self):
+        return "(" + " OR ".join(str(operand) for operand in self.operands) + ")"
+
+
+class Parser:
+    """Recursive descent parser: OR binds loosest, then AND, then NOT"""
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise QueryError("Empty query")
+        node = self.parse_or()
+        if self.position < len(self.tokens):
+            raise QueryError(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.peek() == ("keyword", "OR"):
+            self.take()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else Or(operands)
+
+    def parse_and(self):
+        operands = [self.parse_not()]
+        while self.peek() == ("keyword", "AND"):
+            self.take()
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else And(operands)
+
+    def parse_not(self):
+        if self.peek() == ("keyword", "NOT"):
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        kind, value = self.take()
+        if kind == "lparen":
+            node = self.parse_or()
+            if self.take()[0] != "rparen":
+                raise QueryError("Missing closing parenthesis")
+            return node
+        if kind == "section":
+            section, _, key = value[1:].partition("].")
+            if not key:
+                return SectionPredicate(value[1:-1])
+            return self.parse_comparison(section, key)
+        if kind in ("word", "quoted"):
+            return self.parse_comparison(None, value)
+        raise QueryError(f"Expected a predicate, found {value!r}" if value else "Unexpected end of query")
+
+    def parse_comparison(self, section, key):
+        if self.peek()[0] != "op":
+            return KeyPredicate(section, key)
+        op = self.take()[1]
+        kind, value = self.take()
+        if kind not in ("word", "quoted"):
+            raise QueryError(f"Expected a value after {op!r}")
+        return ValuePredicate(section, key, op, value)
+
+
+def parse_query(text):
+    """Parse a query string into a predicate tree"""
+    return Parser(text).parse()
+
+
+def run_query(index, query, models=None):
+    """Return (matching models, files read) for a parsed query"""
+    context = Context(index)
+    candidates = index.models if models is None else index.models & set(models)
+    return query.evaluate(context, candidates), context.files_read
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boolean queries over a directory of .ini configs")
+    parser.add_argument("directory")
+    parser.add_argument("query")
+    parser.add_argument("--model", help="Only consider this model (relative path or bare model name)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Descend into subdirectories")
+    parser.add_argument("-i", "--include", action="append", default=[], help="Only search files matching this glob")
+    parser.add_argument("-x", "--exclude", action="append", default=[], help="Skip files and directories matching this glob")
+    args = parser.parse_args()
+
+    print()
+    print(f"{BLUE}Search Parameters:{NC}")
+    print(SEPARATOR)
+    if args.model:
+        print(f"Model: {YELLOW}{args.model}{NC}")
+    print(f"Expression: {YELLOW}{args.query}{NC}")
+    print(f"Directory: {YELLOW}{args.directory}{NC}")
+    print(SEPARATOR)
+
+    try:
+        query = parse_query(args.query)
+        index = SectionIndex(args.directory, args.recursive, args.include, args.exclude).refresh()
+    except QueryError as e:
+        print(f"{RED}Error: Invalid expression: {e}{NC}")
+        return 1
+    except OSError as e:
+        print(f"{RED}Error: {e}{NC}")
+        return 1
+
+    models = None
+    if args.model:
+        # As in the search script, --model is the relative path or the bare model name
+        models = [model for model in index.models
+                  if model == args.model or model.rsplit('/', 1)[-1] == args.model]
+        if not models:
+            print(f"{RED}Error: File for model {args.model} not found in {args.directory}{NC}")
+            return 1
+    matched, files_read = run_query(index, query, models)
+    files_searched = len(models) if models else len(index.files)
+
+    print()
+    print(f"{BLUE}Search Results:{NC}")
+    print(SEPARATOR)
+    if matched:
+        for model in sorted(matched):
+            print(f"{GREEN}✓ {model}: Expression matched{NC}")
+    else:
+        print(f"{RED}Expression \"{args.query}\" did not match any searched files.{NC}")
+    print(SEPARATOR)
+
+    print(f"{BLUE}Summary:{NC}")
+    print(SEPARATOR)
+    print(f"Total files searched: {YELLOW}{files_searched}{NC}")
+    print(f"Files with match: {YELLOW}{len(matched)}{NC}")
+    print(f"Files read: {YELLOW}{index.files_read + files_read}{NC}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
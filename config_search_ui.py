@@ -4,14 +4,34 @@ import os
 import subprocess
 import json
 import re
+import sqlite3
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QComboBox, QLineEdit, 
                              QPushButton, QRadioButton, QButtonGroup, QTextEdit, 
                              QGroupBox, QTabWidget, QSplitter, QFileDialog,
-                             QStatusBar, QMessageBox, QFrame, QProgressDialog)
+                             QStatusBar, QMessageBox, QFrame, QProgressDialog,
+                             QCheckBox, QTableWidget, QTableWidgetItem)
 from PyQt5.QtCore import Qt, QProcess, QTimer, QDateTime
 from PyQt5.QtGui import QFont, QColor, QPalette, QTextCursor
 
+from config_corpus import list_archive, select_archive_members, walk_configs
+from config_export import DEFAULT_DATABASE, connect, run_sql
+
+# Rows shown in the SQL tab, to keep huge result sets responsive
+SQL_ROW_LIMIT = 5000
+
+# Snapshot archives that can be searched in place, without extraction
+ARCHIVE_EXTENSIONS = ('.tar.gz', '.tgz', '.zip')
+
+def is_archive(path):
+    """Return True if path is a snapshot archive the search script can stream"""
+    return path.endswith(ARCHIVE_EXTENSIONS) and os.path.isfile(path)
+
+def list_archive_configs(path, recursive=False, include=(), exclude=()):
+    """List the .ini files of an archive as the search script selects them, without extracting it"""
+    return [f"{relative_model}.ini" for relative_model, _name in
+            select_archive_members(list_archive(path), recursive, include, exclude)]
+
 class ConfigSearchApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -225,6 +245,12 @@ class ConfigSearchApp(QMainWindow):
         self.stdout_buffer = ""
         self.stderr_buffer = ""
         
+        # SQL export runs in its own process so the window stays responsive
+        self.export_process = QProcess()
+        self.export_process.finished.connect(self.export_finished)
+        self.export_process.errorOccurred.connect(self.export_error)
+        self.export_progress = None
+        
         # History
         self.search_history = []
         
@@ -280,19 +306,41 @@ class ConfigSearchApp(QMainWindow):
         self.dir_combo.currentTextChanged.connect(self.handle_dir_change)
         
         self.custom_dir_path = QLineEdit()
-        self.custom_dir_path.setPlaceholderText("Enter custom directory path...")
+        self.custom_dir_path.setPlaceholderText("Enter custom directory or archive path...")
         self.custom_dir_path.setEnabled(False)
         self.custom_dir_path.editingFinished.connect(self.handle_custom_dir_change)
         
         browse_button = QPushButton("Browse...")
         browse_button.clicked.connect(self.browse_directory)
         
+        browse_archive_button = QPushButton("Archive...")
+        browse_archive_button.clicked.connect(self.browse_archive)
+        
         dir_path_layout = QHBoxLayout()
         dir_path_layout.addWidget(self.custom_dir_path)
         dir_path_layout.addWidget(browse_button)
+        dir_path_layout.addWidget(browse_archive_button)
+        
+        # Recursive search with include/exclude globs
+        self.recursive_check = QCheckBox("Include subdirectories")
+        self.recursive_check.toggled.connect(self.update_models_list)
+        
+        self.include_input = QLineEdit()
+        self.include_input.setPlaceholderText("Include globs, comma separated (e.g., samsung/*)")
+        self.include_input.editingFinished.connect(self.update_models_list)
+        
+        self.exclude_input = QLineEdit()
+        self.exclude_input.setPlaceholderText("Exclude globs, comma separated (e.g., legacy)")
+        self.exclude_input.editingFinished.connect(self.update_models_list)
+        
+        walk_layout = QHBoxLayout()
+        walk_layout.addWidget(self.recursive_check)
+        walk_layout.addWidget(self.include_input)
+        walk_layout.addWidget(self.exclude_input)
         
         dir_layout.addWidget(self.dir_combo)
         dir_layout.addLayout(dir_path_layout)
+        dir_layout.addLayout(walk_layout)
         
         # Search criteria
         criteria_group = QGroupBox("Search Criteria")
@@ -330,9 +378,23 @@ class ConfigSearchApp(QMainWindow):
         query_layout.addWidget(query_label, 1)
         query_layout.addWidget(self.query_input, 4)
         
+        # Boolean expression search
+        expression_layout = QHBoxLayout()
+        expression_label = QLabel("Expression:")
+        self.expression_input = QLineEdit()
+        self.expression_input.setPlaceholderText("e.g., [Proximity] AND NOT EnableTopBar = True (replaces Section/Query)")
+        expression_layout.addWidget(expression_label, 1)
+        expression_layout.addWidget(self.expression_input, 4)
+        
+        # Show identical sections once when searching all models
+        self.group_sections_check = QCheckBox("Group identical sections across models")
+        self.group_sections_check.setChecked(True)
+        
         criteria_layout.addLayout(model_layout)
         criteria_layout.addLayout(section_layout)
+        criteria_layout.addWidget(self.group_sections_check)
         criteria_layout.addLayout(query_layout)
+        criteria_layout.addLayout(expression_layout)
         
         # Search button
         search_button = QPushButton("Search")
@@ -398,6 +460,40 @@ class ConfigSearchApp(QMainWindow):
         db_layout.addWidget(self.db_text)
         db_layout.addWidget(save_db_button)
         
+        # SQL tab
+        sql_tab = QWidget()
+        sql_layout = QVBoxLayout()
+        sql_tab.setLayout(sql_layout)
+        tabs.addTab(sql_tab, "SQL")
+        
+        sql_db_layout = QHBoxLayout()
+        sql_db_label = QLabel("Database:")
+        self.sql_db_path = QLineEdit(DEFAULT_DATABASE)
+        export_button = QPushButton("Export Selected Directory")
+        export_button.clicked.connect(self.export_to_sql)
+        sql_db_layout.addWidget(sql_db_label)
+        sql_db_layout.addWidget(self.sql_db_path, 4)
+        sql_db_layout.addWidget(export_button)
+        
+        self.sql_input = QTextEdit()
+        self.sql_input.setAcceptRichText(False)
+        self.sql_input.setFont(QFont("Monospace", 10))
+        self.sql_input.setMaximumHeight(120)
+        self.sql_input.setPlainText("SELECT model, value FROM entries\n"
+                                    "WHERE section = 'Proximity' AND key = 'Threshold'\n"
+                                    "ORDER BY model;")
+        
+        run_sql_button = QPushButton("Run Query")
+        run_sql_button.clicked.connect(self.run_sql_query)
+        
+        self.sql_results = QTableWidget()
+        self.sql_results.setEditTriggers(QTableWidget.NoEditTriggers)
+        
+        sql_layout.addLayout(sql_db_layout)
+        sql_layout.addWidget(self.sql_input)
+        sql_layout.addWidget(run_sql_button)
+        sql_layout.addWidget(self.sql_results)
+        
         # Update the database text
         self.update_db_text()
         
@@ -455,7 +551,7 @@ class ConfigSearchApp(QMainWindow):
         # When custom directory path changes, update the models list
         if self.dir_combo.currentText() == "Custom Directory":
             directory = self.custom_dir_path.text()
-            if directory and os.path.isdir(directory):
+            if directory and (os.path.isdir(directory) or is_archive(directory)):
                 self.directories["Custom Directory"] = directory
                 self.update_models_list()
         
@@ -468,6 +564,18 @@ class ConfigSearchApp(QMainWindow):
             # Update models list
             self.update_models_list()
             
+    def browse_archive(self):
+        archive, _ = QFileDialog.getOpenFileName(self, "Select Snapshot Archive", "",
+                                                 "Archives (*.tar.gz *.tgz *.zip)")
+        if archive:
+            self.custom_dir_path.setText(archive)
+            self.directories["Custom Directory"] = archive
+            self.update_models_list()
+            
+    def walk_globs(self, line_edit):
+        """Split a comma separated glob field into a list"""
+        return [glob.strip() for glob in line_edit.text().split(',') if glob.strip()]
+        
     def update_models_list(self):
         """Scan the selected directory and update the models dropdown"""
         self.model_combo.clear()
@@ -477,14 +585,14 @@ class ConfigSearchApp(QMainWindow):
         dir_name = self.dir_combo.currentText()
         if dir_name == "Custom Directory":
             directory = self.custom_dir_path.text()
-            if not directory or not os.path.isdir(directory):
+            if not directory or not (os.path.isdir(directory) or is_archive(directory)):
                 self.status_bar.showMessage("Invalid directory path")
                 return
         else:
             directory = self.directories[dir_name]
             
         # Check if directory exists
-        if not os.path.isdir(directory):
+        if not os.path.isdir(directory) and not is_archive(directory):
             self.status_bar.showMessage(f"Directory not found: {directory}")
             return
             
@@ -495,7 +603,16 @@ class ConfigSearchApp(QMainWindow):
         
         try:
             # Get all .ini files
-            ini_files = [f for f in os.listdir(directory) if f.endswith('.ini')]
+            include = self.walk_globs(self.include_input)
+            exclude = self.walk_globs(self.exclude_input)
+            if is_archive(directory):
+                ini_files = list_archive_configs(directory, self.recursive_check.isChecked(), include, exclude)
+            elif self.recursive_check.isChecked() or include or exclude:
+                # Relative paths keep models in different subdirectories apart
+                ini_files = [f"{relative_model}.ini" for relative_model, _path in
+                             walk_configs(directory, self.recursive_check.isChecked(), include, exclude)]
+            else:
+                ini_files = [f for f in os.listdir(directory) if f.endswith('.ini')]
             
             # Process each file
             for idx, file in enumerate(ini_files):
@@ -506,7 +623,7 @@ class ConfigSearchApp(QMainWindow):
                 model_code = os.path.splitext(file)[0]  # Remove .ini extension
                 
                 # Look up the model name in our database
-                market_name = self.model_database.get(model_code, "")
+                market_name = self.model_database.get(os.path.basename(model_code), "")
                 
                 # Create display name
                 if market_name:
@@ -552,8 +669,8 @@ class ConfigSearchApp(QMainWindow):
                 model = entered_text
                 
         # Check if at least one search criterion is provided
-        if not any([model, self.section_input.text(), self.query_input.text()]):
-            QMessageBox.warning(self, "Warning", "Please provide at least one search criterion (Model, Section, or Query).")
+        if not any([model, self.section_input.text(), self.query_input.text(), self.expression_input.text()]):
+            QMessageBox.warning(self, "Warning", "Please provide at least one search criterion (Model, Section, Query or Expression).")
             return
             
         # Clear previous results
@@ -570,7 +687,7 @@ class ConfigSearchApp(QMainWindow):
             if not directory:
                 QMessageBox.warning(self, "Warning", "Please specify a custom directory path.")
                 return
-            if not os.path.isdir(directory):
+            if not os.path.isdir(directory) and not is_archive(directory):
                 QMessageBox.critical(self, "Error", f"Directory does not exist: {directory}")
                 return
         else:
@@ -611,11 +728,26 @@ class ConfigSearchApp(QMainWindow):
         if model:
             args.extend(["-m", model])
             
-        section = self.section_input.text()
+        if self.recursive_check.isChecked():
+            args.append("-r")
+        for glob in self.walk_globs(self.include_input):
+            args.extend(["-i", glob])
+        for glob in self.walk_globs(self.exclude_input):
+            args.extend(["-x", glob])
+        if self.group_sections_check.isChecked():
+            args.append("-g")
+            
+        # An expression replaces the section and query criteria
+        expression = self.expression_input.text()
+        section = "" if expression else self.section_input.text()
+        query = "" if expression else self.query_input.text()
+        
+        if expression:
+            args.extend(["-q", expression])
+            
         if section:
             args.extend(["-s", section])
             
-        query = self.query_input.text()
         if query:
             args.extend(["-z", query])
             
@@ -630,6 +762,8 @@ class ConfigSearchApp(QMainWindow):
             search_params += f"Section: {section}\n"
         if query:
             search_params += f"Query: {query}\n"
+        if expression:
+            search_params += f"Expression: {expression}\n"
         search_params += "-------------------------------\n"
         
         self.search_history.append(search_params)
@@ -701,7 +835,7 @@ class ConfigSearchApp(QMainWindow):
                     text)
         
         # Format numbers in summary
-        text = re.sub(r'(Total files searched: )(\d+)', 
+        text = re.sub(r'(Total files searched: |Distinct sections: )(\d+)', 
                     r'\1<span style="color: #BBBB00;">\2</span>', 
                     text)
         text = re.sub(r'(Files with match: )(\d+)', 
@@ -798,6 +932,7 @@ class ConfigSearchApp(QMainWindow):
         self.model_combo.setCurrentIndex(0)  # Reset to "All Models"
         self.section_input.clear()
         self.query_input.clear()
+        self.expression_input.clear()
         self.results_text.clear()
         self.status_bar.showMessage("Ready")
         
@@ -809,6 +944,86 @@ class ConfigSearchApp(QMainWindow):
     def clear_history(self):
         self.search_history = []
         self.history_text.clear()
+        
+    def export_to_sql(self):
+        """Export the selected directory to the SQL tab's database"""
+        dir_name = self.dir_combo.currentText()
+        if dir_name == "Custom Directory":
+            directory = self.custom_dir_path.text()
+        else:
+            directory = self.directories[dir_name]
+        if not directory or not os.path.isdir(directory):
+            QMessageBox.warning(self, "Warning", f"Only directories can be exported: {directory}")
+            return
+        if self.export_process.state() != QProcess.NotRunning:
+            return
+            
+        export_script = os.path.join(os.path.dirname(os.path.realpath(__file__)), "config_export.py")
+        args = [export_script, directory, "--db", self.sql_db_path.text()]
+        if self.recursive_check.isChecked():
+            args.append("-r")
+            
+        # The export is one transaction, so cancelling leaves the database as it was
+        self.export_progress = QProgressDialog(f"Exporting {directory}...", "Cancel", 0, 0, self)
+        self.export_progress.setWindowModality(Qt.WindowModal)
+        self.export_progress.canceled.connect(self.export_process.kill)
+        self.export_progress.show()
+        
+        self.status_bar.showMessage(f"Exporting {directory}...")
+        self.export_process.start(sys.executable, args)
+        
+    def export_error(self, error):
+        """finished is not emitted when the export process cannot start"""
+        if error == QProcess.FailedToStart and self.export_progress is not None:
+            self.export_progress.close()
+            self.export_progress = None
+            QMessageBox.critical(self, "Error", f"Export failed: {self.export_process.errorString()}")
+            self.status_bar.showMessage("Export failed")
+            
+    def export_finished(self, exit_code, exit_status):
+        """Report the outcome of the export process"""
+        cancelled = self.export_progress.wasCanceled()
+        self.export_progress.close()
+        self.export_progress = None
+        
+        output = re.sub(r'\x1b\[[0-9;]*m', '', self.export_process.readAllStandardOutput().data().decode())
+        errors = re.sub(r'\x1b\[[0-9;]*m', '', self.export_process.readAllStandardError().data().decode())
+        if cancelled:
+            self.status_bar.showMessage("Export cancelled")
+        elif exit_status != QProcess.NormalExit or exit_code != 0:
+            QMessageBox.critical(self, "Error", f"Export failed: {errors.strip() or output.strip()}")
+            self.status_bar.showMessage("Export failed")
+        else:
+            counts = dict(re.findall(r'^Files (\w+): (\d+)$', output, re.MULTILINE))
+            self.status_bar.showMessage(f"Exported {counts.get('exported', 0)} files "
+                                        f"({counts.get('unchanged', 0)} unchanged, {counts.get('removed', 0)} removed)")
+            
+    def run_sql_query(self):
+        """Run the SQL tab's query and show the rows in the table"""
+        try:
+            connection = connect(self.sql_db_path.text())
+            try:
+                columns, rows = run_sql(connection, self.sql_input.toPlainText(), SQL_ROW_LIMIT)
+            finally:
+                connection.close()
+        except (OSError, sqlite3.Error) as e:
+            QMessageBox.critical(self, "Error", f"Query failed: {str(e)}")
+            return
+            
+        self.sql_results.clear()
+        self.sql_results.setColumnCount(len(columns))
+        self.sql_results.setHorizontalHeaderLabels(columns)
+        self.sql_results.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            for column_index, value in enumerate(row):
+                self.sql_results.setItem(row_index, column_index,
+                                         QTableWidgetItem("" if value is None else str(value)))
+        self.sql_results.resizeColumnsToContents()
+        
+        message = f"Query returned {len(rows)} rows"
+        if len(rows) == SQL_ROW_LIMIT:
+            message += f" (limited to {SQL_ROW_LIMIT})"
+        self.status_bar.showMessage(message)
 
 def apply_dark_style(app):
     app.setStyle("Fusion")
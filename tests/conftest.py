@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+# The tools are plain scripts next to the tests directory, not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CONFIGS = {
+    "a01q": """[General]
+Name = Galaxy A01
+EnableTopBar = True
+
+[Proximity]
+Threshold = 5
+
+[CameraRearPhoto]
+CamerasToSkip = 6
+""",
+    "a02q": """[General]
+Name = Galaxy A02
+EnableTopBar = False
+
+[Proximity]
+Threshold = 9
+""",
+    "iPhone14,4": """[General]
+Name = iPhone 13 mini
+EnableTopBar = True
+
+[CameraRearPhoto]
+CamerasToSkip = 12
+Resolution = 12
+""",
+    "x800": """[General]
+Name = XP Pro 5G
+
+[Proximity]
+Threshold = high
+
+[Legacy]
+Enabled = 1
+""",
+}
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    """A small directory of configs covering present, missing and odd values"""
+    directory = tmp_path / "configs"
+    directory.mkdir()
+    for model, text in CONFIGS.items():
+        (directory / f"{model}.ini").write_text(text, encoding="utf-8")
+    return directory
@@ -0,0 +1,174 @@
+import json
+
+import pytest
+
+from config_lint import Rule, RuleError, RuleSet, lint_directory
+
+from conftest import CONFIGS
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+def violations(specs, model="a01q"):
+    """(rule id, problem, value) for each violation of one fixture config"""
+    return [(violation.rule.id, violation.problem, violation.value)
+            for violation in RuleSet(specs).check(model, CONFIGS[model])]
+
+
+def test_required_section():
+    spec = {"id": "r", "section": "Legacy", "required": True}
+    assert violations([spec]) == [("r", "is missing", None)]
+    assert violations([spec], "x800") == []
+
+
+def test_required_key():
+    spec = {"id": "r", "section": "General", "key": "EnableTopBar", "required": True}
+    assert violations([spec]) == []
+    assert violations([spec], "x800") == [("r", "is missing", None)]
+
+
+def test_key_rule_skips_models_without_the_section():
+    spec = {"id": "r", "section": "Proximity", "key": "Threshold", "required": True}
+    assert violations([spec], "iPhone14,4") == []
+
+
+def test_forbidden():
+    section_spec = {"id": "s", "section": "Legacy", "forbidden": True}
+    key_spec = {"id": "k", "section": "Legacy", "key": "Enabled", "forbidden": True}
+    assert violations([section_spec, key_spec]) == []
+    assert violations([section_spec, key_spec], "x800") == [
+        ("s", "must not be present", None),
+        ("k", "must not be set", "1"),
+    ]
+
+
+def test_equals():
+    spec = {"id": "e", "section": "Proximity", "key": "Threshold", "equals": 5}
+    assert violations([spec]) == []
+    assert violations([spec], "a02q") == [("e", "must be 5", "9")]
+
+
+def test_one_of():
+    spec = {"id": "o", "section": "General", "key": "EnableTopBar", "one_of": ["True"]}
+    assert violations([spec]) == []
+    assert violations([spec], "a02q") == [("o", "must be one of True", "False")]
+
+
+def test_pattern():
+    spec = {"id": "p", "section": "General", "key": "Name", "pattern": "^Galaxy "}
+    assert violations([spec]) == []
+    assert violations([spec], "iPhone14,4") == [("p", "must match ^Galaxy ", "iPhone 13 mini")]
+
+
+def test_min_max():
+    spec = {"id": "m", "section": "Proximity", "key": "Threshold", "min": 1, "max": 8}
+    assert violations([spec]) == []
+    assert violations([spec], "a02q") == [("m", "must be at most 8", "9")]
+    assert violations([spec], "x800") == [("m", "must be a number", "high")]
+    spec = {"id": "m", "section": "Proximity", "key": "Threshold", "min": 6.5}
+    assert violations([spec]) == [("m", "must be at least 6.5", "5")]
+
+
+def test_when_section():
+    spec = {"id": "w", "section": "General", "key": "EnableTopBar", "required": True,
+            "when_section": "Proximity"}
+    assert violations([spec], "x800") == [("w", "is missing", None)]
+    assert violations([spec], "iPhone14,4") == []
+
+
+def test_models():
+    spec = {"id": "g", "section": "Legacy", "required": True, "models": ["a0*"]}
+    assert violations([spec]) == [("g", "is missing", None)]
+    assert violations([spec], "iPhone14,4") == []
+
+
+def test_severity_and_message():
+    rule_set = RuleSet([{"id": "w", "section": "Legacy", "required": True,
+                         "severity": "warning", "message": "no legacy block"}])
+    [violation] = rule_set.check("a01q", CONFIGS["a01q"])
+    assert violation.rule.severity == "warning"
+    assert violation.message == "no legacy block"
+    assert violation.as_dict()["severity"] == "warning"
+
+    [violation] = RuleSet([{"id": "e", "section": "Legacy", "required": True}]).check("a01q", CONFIGS["a01q"])
+    assert violation.rule.severity == "error"
+    assert violation.message == "[Legacy] is missing"
+
+
+def test_violation_lines():
+    [violation] = RuleSet([{"id": "e", "section": "Proximity", "key": "Threshold", "equals": "1"}]).check(
+        "a01q", CONFIGS["a01q"])
+    assert violation.line == 6
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"section": "General", "required": True}, "missing 'id'"),
+    ({"id": "x", "required": True}, "missing 'section'"),
+    ({"id": "x", "section": "General", "required": True, "colour": "red"}, "unknown fields colour"),
+    ({"id": "x", "section": "General", "required": True, "severity": "fatal"}, "severity must be one of"),
+    ({"id": "x", "section": "General", "key": "Name", "pattern": "("}, "invalid pattern"),
+    ({"id": "x", "section": "General", "equals": "1"}, "value checks need a 'key'"),
+    ({"id": "x", "section": "General"}, "nothing to check"),
+    ({"id": "x", "section": "General", "required": True, "forbidden": True}, "cannot both be set"),
+    ({"id": "x", "section": "General", "required": "false"}, "'required' must be true or false"),
+    ({"id": "x", "section": "General", "forbidden": 1}, "'forbidden' must be true or false"),
+    ({"id": "x", "section": "General", "key": "Name", "min": "1"}, "'min' must be a number"),
+    ({"id": "x", "section": "General", "key": "Name", "max": True}, "'max' must be a number"),
+    ({"id": "x", "section": "General", "key": "Name", "one_of": "True"}, "'one_of' must be a list"),
+    ({"id": "x", "section": "General", "required": True, "models": "a0*"}, "'models' must be a list"),
+    ({"id": "x", "section": "General", "key": "Name", "pattern": 5}, "'pattern' must be a string"),
+    ({"id": "x", "section": "General", "required": True, "when_section": ["A"]}, "'when_section' must be a string"),
+    ("General", "must be a mapping"),
+])
+def test_invalid_rules(spec, message):
+    with pytest.raises(RuleError, match=message):
+        Rule(spec)
+
+
+def test_duplicate_ids():
+    spec = {"id": "x", "section": "General", "required": True}
+    with pytest.raises(RuleError, match="Duplicate rule ids: x"):
+        RuleSet([spec, spec])
+
+
+def test_load_json(tmp_path):
+    rules = [{"id": "x", "section": "General", "required": True}]
+    as_list = tmp_path / "list.json"
+    as_list.write_text(json.dumps(rules), encoding="utf-8")
+    as_dict = tmp_path / "dict.json"
+    as_dict.write_text(json.dumps({"rules": rules}), encoding="utf-8")
+    assert [rule.id for rule in RuleSet.load(str(as_list)).rules] == ["x"]
+    assert [rule.id for rule in RuleSet.load(str(as_dict)).rules] == ["x"]
+
+
+@pytest.mark.parametrize("content, message", [
+    (b"{\"rules\": [", "Invalid JSON"),
+    (b"{\"other\": []}", "must contain a list of rules"),
+    (b"\xff\xfe[]", "is not UTF-8"),
+])
+def test_load_errors(tmp_path, content, message):
+    path = tmp_path / "rules.json"
+    path.write_bytes(content)
+    with pytest.raises(RuleError, match=message):
+        RuleSet.load(str(path))
+
+
+@pytest.mark.skipif(yaml is None, reason="PyYAML is not installed")
+def test_load_yaml(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_text("rules:\n  - id: x\n    section: General\n    required: true\n", encoding="utf-8")
+    assert [rule.id for rule in RuleSet.load(str(path)).rules] == ["x"]
+
+    path.write_text("rules:\n  - id: [x\n", encoding="utf-8")
+    with pytest.raises(RuleError, match="Invalid YAML"):
+        RuleSet.load(str(path))
+
+
+def test_lint_directory(config_dir):
+    rule_set = RuleSet([{"id": "p", "section": "Proximity", "key": "Threshold", "min": 1, "max": 8}])
+    files_checked, found = lint_directory(rule_set, str(config_dir))
+    assert files_checked == len(CONFIGS)
+    assert sorted(violation.model for violation in found) == ["a02q", "x800"]
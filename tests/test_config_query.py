@@ -0,0 +1,123 @@
+import pytest
+
+from config_corpus import SectionIndex, parse_entries, parse_sections
+from config_query import (And, KeyPredicate, Not, Or, QueryError,
+                          SectionPredicate, ValuePredicate, parse_query,
+                          run_query)
+
+from conftest import CONFIGS
+
+
+@pytest.fixture
+def index(config_dir, tmp_path):
+    return SectionIndex(config_dir, cache_dir=tmp_path / "cache").refresh()
+
+
+def naive_matches(node, entries):
+    """Evaluate a predicate against one model's parsed entries, without any planning"""
+    if isinstance(node, SectionPredicate):
+        return node.section in entries
+    if isinstance(node, KeyPredicate):
+        for section, section_entries in entries.items():
+            if node.section is not None and section != node.section:
+                continue
+            for key, value, _line in section_entries:
+                if key == node.key and (not isinstance(node, ValuePredicate) or node.matches(value)):
+                    return True
+        return False
+    if isinstance(node, Not):
+        return not naive_matches(node.operand, entries)
+    if isinstance(node, And):
+        return all(naive_matches(operand, entries) for operand in node.operands)
+    if isinstance(node, Or):
+        return any(naive_matches(operand, entries) for operand in node.operands)
+    raise TypeError(node)
+
+
+def naive_query(query):
+    matched = set()
+    for model, text in CONFIGS.items():
+        entries = {}
+        for name, line, body in parse_sections(text):
+            entries.setdefault(name, []).extend(parse_entries(body, line))
+        if naive_matches(query, entries):
+            matched.add(model)
+    return matched
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("[A] OR [B] AND [C]", "([A] OR ([B] AND [C]))"),
+    ("[A] AND [B] OR [C]", "(([A] AND [B]) OR [C])"),
+    ("([A] OR [B]) AND [C]", "(([A] OR [B]) AND [C])"),
+    ("NOT [A] AND [B]", "(NOT [A] AND [B])"),
+    ("NOT ([A] AND [B])", "NOT ([A] AND [B])"),
+    ("NOT NOT [A]", "NOT NOT [A]"),
+    ("[A] and not [B] or [C]", "(([A] AND NOT [B]) OR [C])"),
+])
+def test_precedence(text, expected):
+    assert str(parse_query(text)) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("[Proximity]", "[Proximity]"),
+    ("[Proximity].Threshold", "[Proximity].Threshold"),
+    ("Threshold = 5", "Threshold = 5"),
+    ("[General].Name = \"Galaxy A01\"", "[General].Name = Galaxy A01"),
+    ("[General].Name ~ \"^Galaxy \\\"?A\"", "[General].Name ~ ^Galaxy \"?A"),
+])
+def test_predicates(text, expected):
+    assert str(parse_query(text)) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "   ",
+    "[Proximity",
+    "([Proximity]",
+    "[Proximity])",
+    "[Proximity] AND",
+    "NOT",
+    "[Proximity] [General]",
+    "Threshold =",
+    "Threshold = (",
+    "Threshold ~ \"[\"",
+    "AND [Proximity]",
+])
+def test_parse_errors(text):
+    with pytest.raises(QueryError):
+        parse_query(text)
+
+
+@pytest.mark.parametrize("text", [
+    "[Proximity]",
+    "NOT [Proximity]",
+    "[Proximity].Threshold",
+    "Threshold = 5",
+    "Threshold ~ ^[0-9]+$",
+    "[Proximity] AND NOT [Proximity].Threshold = 5",
+    "EnableTopBar = True OR ([CameraRearPhoto] AND CamerasToSkip ~ \"^[0-9]+$\")",
+    "NOT (EnableTopBar = True OR [Legacy]) AND Name ~ Galaxy",
+    "[General].Name ~ \"i\" AND NOT [Proximity] OR [Legacy].Enabled = 1",
+    "[Missing] OR NOT [Missing].Key",
+    "[Missing] AND Threshold = 5",
+])
+def test_planner_matches_naive_evaluation(index, text):
+    query = parse_query(text)
+    matched, _files_read = run_query(index, query)
+    assert matched == naive_query(query)
+
+
+def test_planner_reads_only_needed_files(index):
+    # Only the one model with a Legacy section is left for the value predicate
+    matched, files_read = run_query(index, parse_query("Threshold = high AND [Legacy]"))
+    assert matched == {"x800"}
+    assert files_read == 1
+
+    matched, files_read = run_query(index, parse_query("[Proximity] AND [Missing].Key = 1"))
+    assert matched == set()
+    assert files_read == 0
+
+
+def test_model_filter(index):
+    matched, _files_read = run_query(index, parse_query("[Proximity]"), ["a02q", "iPhone14,4"])
+    assert matched == {"a02q"}